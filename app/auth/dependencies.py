@@ -1,16 +1,39 @@
+import time
+from functools import lru_cache
 from fastapi import Depends
 from app.auth.router import oauth2_scheme
-from app.db.database import db
+from app.db.database import (
+    admins_collection,
+    students_collection,
+    teachers_collection,
+    users_collection,
+)
+from app.utils.cache import token_claims_cache, user_cache
 from app.utils.security import decode_token
 from bson import ObjectId
 from fastapi import HTTPException
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    payload = decode_token(token)
+async def get_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
+    # Decoded once per request; FastAPI caches this for every dependant.
+    # Verified claims are also reused across requests until the token expires.
+    # async so the cache hit runs on the event loop instead of the threadpool.
+    payload = token_claims_cache.get(token)
+    if payload is None or payload.get("exp", 0) <= time.time():
+        payload = decode_token(token)
+        token_claims_cache.set(token, payload)
+    return payload
+
+
+async def get_current_user(payload: dict = Depends(get_token_payload)):
+
+    # Cache-aside: the resolved context is reused for a few seconds per user
+    cached = user_cache.get(payload["user_id"])
+    if cached is not None:
+        return cached
 
     # Allow multiple valid statuses (active for teachers/admins, studying for students)
-    user = await db.users.find_one(
+    user = await users_collection.find_one(
         {"_id": ObjectId(payload["user_id"]), "status": {"$in": ["active", "studying"]}}
     )
 
@@ -27,37 +50,75 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
 
         # Fetch tenantId from the role-specific collection
         if role == "teacher":
-            role_doc = await db.teachers.find_one({"userId": user_id})
+            role_doc = await teachers_collection.find_one({"userId": user_id})
             if role_doc:
                 tenant_id = role_doc.get("tenantId")
         elif role == "student":
-            role_doc = await db.students.find_one({"userId": user_id})
+            role_doc = await students_collection.find_one({"userId": user_id})
             if role_doc:
                 tenant_id = role_doc.get("tenantId")
         elif role == "admin":
-            role_doc = await db.admins.find_one({"userId": user_id})
+            role_doc = await admins_collection.find_one({"userId": user_id})
             if role_doc:
                 tenant_id = role_doc.get("tenantId")
 
-    return {
+    current_user = {
         "user_id": str(user["_id"]),
         "role": user["role"],
         "tenant_id": str(tenant_id) if tenant_id else None,
     }
+    user_cache.set(current_user["user_id"], current_user)
+    return current_user
 
 
-def require_role(*allowed_roles: str):
-    def role_checker(current_user=Depends(get_current_user)):
-        if current_user["role"] not in allowed_roles:
-            raise HTTPException(status_code=403, detail="Forbidden: Insufficient Role")
-        return current_user
+def _check_role(current_user: dict, allowed_roles) -> None:
+    if current_user["role"] not in allowed_roles:
+        raise HTTPException(status_code=403, detail="Forbidden: Insufficient Role")
 
-    return role_checker
 
-
-def require_tenant(current_user=Depends(get_current_user)):
+def _check_tenant(current_user: dict) -> None:
     if not current_user.get("tenant_id"):
         raise HTTPException(
             status_code=403, detail="Tenant context required for this operation"
         )
+
+
+@lru_cache(maxsize=None)
+def _role_checker(allowed_roles: frozenset):
+    async def role_checker(current_user=Depends(get_current_user)):
+        _check_role(current_user, allowed_roles)
+        return current_user
+
+    return role_checker
+
+
+def require_role(*allowed_roles: str):
+    # Same role set -> same callable, so FastAPI's per-request dependency cache is shared
+    return _role_checker(frozenset(allowed_roles))
+
+
+async def require_tenant(current_user=Depends(get_current_user)):
+    _check_tenant(current_user)
     return current_user
+
+
+@lru_cache(maxsize=None)
+def _role_and_tenant_checker(allowed_roles: frozenset):
+    async def role_and_tenant_checker(current_user=Depends(get_current_user)):
+        _check_role(current_user, allowed_roles)
+        _check_tenant(current_user)
+        return current_user
+
+    return role_and_tenant_checker
+
+
+def require_role_and_tenant(*allowed_roles: str):
+    """Role and tenant checks in a single dependency."""
+    return _role_and_tenant_checker(frozenset(allowed_roles))
+
+
+async def get_current_admin_id(payload: dict = Depends(get_token_payload)) -> str:
+    admin_id = payload.get("admin_id")
+    if not admin_id:
+        raise HTTPException(status_code=403, detail="Admin profile required")
+    return admin_id
@@ -1 +1,16 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
 TENANT_ID = "691eaf8f6a01d7ff35403568"
+
+# Explicit CORS allowlist (comma-separated in the environment). Origins never carry a path.
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv(
+        "CORS_ORIGINS",
+        "http://localhost:4200,http://localhost:8000,http://127.0.0.1:4200,http://127.0.0.1:8000",
+    ).split(",")
+    if origin.strip()
+]
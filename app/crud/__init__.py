@@ -0,0 +1,23 @@
+import re
+from functools import lru_cache
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+# 24 hex digits; checking the string avoids constructing an ObjectId per validation
+_OID_RE = re.compile(r"[0-9a-fA-F]{24}")
+
+
+@lru_cache(maxsize=8192)
+def oid(s: str) -> ObjectId:
+    """Cached ObjectId construction; tenant/user IDs repeat on every request."""
+    return ObjectId(s)
+
+
+def validate_object_id(value: str, name: str = "id") -> ObjectId:
+    """Raise a 400 unless `value` is an ObjectId string; returns the cached ObjectId."""
+    if not isinstance(value, str) or not _OID_RE.fullmatch(value):
+        raise HTTPException(
+            status_code=400, detail=f"Invalid ObjectId format for {name}"
+        )
+    return oid(value)
@@ -1,4 +1,10 @@
-from app.db.database import db, users_collection
+from app.db.database import (
+    users_collection,
+    admins_collection,
+    courses_collection,
+    teachers_collection,
+)
+from app.utils.cache import invalidate_user
 from app.schemas.admins import AdminCreate, AdminUpdateProfile
 from passlib.context import CryptContext
 from bson import ObjectId
@@ -97,7 +103,7 @@ async def get_admin_by_email(email: str):
     user = await users_collection.find_one({"email": email, "role": "admin"})
     if not user:
         return None
-    admin = await db.admins.find_one({"userId": user["_id"]})
+    admin = await admins_collection.find_one({"userId": user["_id"]})
     return merge_user_data_admin(admin, user)
 
 async def create_admin(admin: AdminCreate):
@@ -134,7 +140,7 @@ async def create_admin(admin: AdminCreate):
         "createdAt": datetime.utcnow(),
         "updatedAt": datetime.utcnow()
     }
-    await db.admins.insert_one(admin_doc)
+    await admins_collection.insert_one(admin_doc)
     
     return merge_user_data_admin(admin_doc, user_doc)
 
@@ -146,34 +152,42 @@ async def create_admin_profile(user_id: str, tenant_id: str = None):
         "createdAt": datetime.utcnow(),
         "updatedAt": datetime.utcnow()
     }
-    await db.admins.insert_one(admin_doc)
+    await admins_collection.insert_one(admin_doc)
     return admin_doc
 
 
 async def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
+async def get_admin_profile(admin_id: str):
+    admin = await admins_collection.find_one({"_id": ObjectId(admin_id)})
+    if not admin:
+        return None
+    user = await users_collection.find_one({"_id": admin.get("userId")})
+    return merge_user_data_admin(admin, user)
+
 async def update_admin_profile(admin_id: str, data: AdminUpdateProfile):
-    admin = await db.admins.find_one({"_id": ObjectId(admin_id)})
+    admin = await admins_collection.find_one({"_id": ObjectId(admin_id)})
     if not admin:
         return None
     
     user_id = admin.get("userId")
-    update_data = clean_update_data(data.dict())
+    update_data = clean_update_data(data.model_dump(exclude_unset=True))
     if not update_data:
-        return await merge_user_data_admin(admin, await users_collection.find_one({"_id": user_id}))
+        return merge_user_data_admin(admin, await users_collection.find_one({"_id": user_id}))
 
     if user_id:
         await users_collection.update_one({"_id": user_id}, {"$set": update_data})
+        invalidate_user(user_id)
     
-    await db.admins.update_one({"_id": ObjectId(admin_id)}, {"$set": {"updatedAt": datetime.utcnow()}})
+    await admins_collection.update_one({"_id": ObjectId(admin_id)}, {"$set": {"updatedAt": datetime.utcnow()}})
     
-    admin = await db.admins.find_one({"_id": ObjectId(admin_id)})
+    admin = await admins_collection.find_one({"_id": ObjectId(admin_id)})
     user = await users_collection.find_one({"_id": user_id})
     return merge_user_data_admin(admin, user)
 
 async def update_admin_password(admin_id: str, old_password: str, new_password: str):
-    admin = await db.admins.find_one({"_id": ObjectId(admin_id)})
+    admin = await admins_collection.find_one({"_id": ObjectId(admin_id)})
     if not admin:
         raise ValueError("Admin not found")
     
@@ -194,12 +208,12 @@ async def update_admin_password(admin_id: str, old_password: str, new_password:
         {"$set": {"password": hashed_password, "updatedAt": datetime.utcnow()}}
     )
     
-    await db.admins.update_one(
+    await admins_collection.update_one(
         {"_id": ObjectId(admin_id)},
         {"$set": {"updatedAt": datetime.utcnow()}}
     )
     
-    admin = await db.admins.find_one({"_id": ObjectId(admin_id)})
+    admin = await admins_collection.find_one({"_id": ObjectId(admin_id)})
     user = await users_collection.find_one({"_id": user_id})
     return merge_user_data_admin(admin, user)
 
@@ -208,13 +222,13 @@ async def update_admin_password(admin_id: str, old_password: str, new_password:
 # ------------------ Dashboard Functions (Lazy Imports & Serialization) ------------------
 
 async def get_all_courses():
-    courses_cursor = db.courses.find({})
+    courses_cursor = courses_collection.find({})
     courses = []
     async for course in courses_cursor:
         teacher_name = ""
         teacher_id = course.get("teacherId")
         try:
-            teacher_doc = await db.teachers.find_one({"_id": ObjectId(teacher_id)})
+            teacher_doc = await teachers_collection.find_one({"_id": ObjectId(teacher_id)})
             if teacher_doc:
                 teacher_name = teacher_doc.get("fullName", "")
         except:
@@ -1,114 +1,10 @@
-# from app.db.database import db
-# from datetime import datetime
-# from bson import ObjectId
-# from typing import List, Optional
-
-
-# def serialize_submission(sub):
-#     return {
-#         "id": str(sub["_id"]),
-#         "studentId": str(sub["studentId"]),
-#         "assignmentId": str(sub["assignmentId"]),
-#         "submittedAt": sub["submittedAt"],
-#         "fileUrl": sub["fileUrl"],
-#         "obtainedMarks": sub.get("obtainedMarks"),
-#         "feedback": sub.get("feedback"),
-#         "courseId": str(sub["courseId"]),
-#         "tenantId": str(sub["tenantId"]),
-#         "gradedAt": sub.get("gradedAt"),
-#     }
-
-
-# async def create_submission(data, student_id: str, tenant_id: str):
-#     submission = {
-#         "studentId": ObjectId(student_id),
-#         "assignmentId": ObjectId(data.assignmentId),
-#         "courseId": ObjectId(data.courseId),
-#         "tenantId": ObjectId(tenant_id),
-#         "fileUrl": data.fileUrl,
-#         "submittedAt": datetime.utcnow(),
-#         "obtainedMarks": None,
-#         "feedback": None,
-#         "gradedAt": None,
-#     }
-
-#     result = await db.assignmentSubmissions.insert_one(submission)
-#     doc = await db.assignmentSubmissions.find_one({"_id": result.inserted_id})
-#     return serialize_submission(doc)
-
-
-# async def get_all_submissions(tenant_id: str) -> List[dict]:
-#     cursor = db.assignmentSubmissions.find({"tenantId": ObjectId(tenant_id)}).sort(
-#         "submittedAt", -1
-#     )
-#     return [serialize_submission(s) async for s in cursor]
-
-
-# async def get_submissions_by_student(student_id: str, tenant_id: str):
-#     cursor = db.assignmentSubmissions.find(
-#         {
-#             "studentId": ObjectId(student_id),
-#             "tenantId": ObjectId(tenant_id),
-#         }
-#     )
-#     return [serialize_submission(s) async for s in cursor]
-
-
-# async def get_submissions_by_assignment(assignment_id: str, tenant_id: str):
-#     cursor = db.assignmentSubmissions.find(
-#         {
-#             "assignmentId": ObjectId(assignment_id),
-#             "tenantId": ObjectId(tenant_id),
-#         }
-#     )
-#     return [serialize_submission(s) async for s in cursor]
-
-
-# async def grade_submission(
-#     submission_id: str,
-#     tenant_id: str,
-#     marks: Optional[int],
-#     feedback: Optional[str],
-# ):
-#     updates = {"gradedAt": datetime.utcnow()}
-#     if marks is not None:
-#         updates["obtainedMarks"] = marks
-#     if feedback is not None:
-#         updates["feedback"] = feedback
-
-#     await db.assignmentSubmissions.update_one(
-#         {
-#             "_id": ObjectId(submission_id),
-#             "tenantId": ObjectId(tenant_id),
-#         },
-#         {"$set": updates},
-#     )
-
-#     doc = await db.assignmentSubmissions.find_one(
-#         {
-#             "_id": ObjectId(submission_id),
-#             "tenantId": ObjectId(tenant_id),
-#         }
-#     )
-#     return serialize_submission(doc)
-
-
-# async def delete_submission(submission_id: str, tenant_id: str):
-#     result = await db.assignmentSubmissions.delete_one(
-#         {
-#             "_id": ObjectId(submission_id),
-#             "tenantId": ObjectId(tenant_id),
-#         }
-#     )
-#     return result.deleted_count > 0
-
-
-from app.db.database import db
+from app.db.database import assignment_submissions_collection
 from datetime import datetime
 from bson import ObjectId
 from bson.errors import InvalidId
 from typing import List, Optional
 from fastapi import HTTPException
+from app.crud import oid
 
 
 # ---------------------------
@@ -117,7 +13,7 @@ from fastapi import HTTPException
 def to_oid(id_str: str, field: str = "id") -> ObjectId:
     """Convert string to ObjectId and validate."""
     try:
-        return ObjectId(id_str)
+        return oid(id_str)
     except (InvalidId, TypeError):
         raise HTTPException(status_code=400, detail=f"Invalid {field}")
 
@@ -176,8 +72,8 @@ async def create_submission(data, student_id: str, tenant_id: str) -> dict:
         "gradedAt": None,
     }
 
-    result = await db.assignmentSubmissions.insert_one(submission)
-    doc = await db.assignmentSubmissions.find_one({"_id": result.inserted_id})
+    result = await assignment_submissions_collection.insert_one(submission)
+    doc = await assignment_submissions_collection.find_one({"_id": result.inserted_id})
     if not doc:
         raise HTTPException(status_code=500, detail="Failed to create submission")
     return serialize_submission(doc)
@@ -186,18 +82,18 @@ async def create_submission(data, student_id: str, tenant_id: str) -> dict:
 # ---------------------------
 # GET ALL SUBMISSIONS (Admin / Teacher)
 # ---------------------------
-async def get_all_submissions(tenant_id: str) -> List[dict]:
-    cursor = db.assignmentSubmissions.find(
+def get_all_submissions_cursor(tenant_id: str):
+    """Return the unconsumed cursor so the router can stream rows."""
+    return assignment_submissions_collection.find(
         {"tenantId": to_oid(tenant_id, "tenantId")}
     ).sort("submittedAt", -1)
-    return [serialize_submission(s) async for s in cursor]
 
 
 # ---------------------------
 # GET SUBMISSIONS BY STUDENT
 # ---------------------------
 async def get_submissions_by_student(student_id: str, tenant_id: str) -> List[dict]:
-    cursor = db.assignmentSubmissions.find(
+    cursor = assignment_submissions_collection.find(
         {
             "studentId": to_oid(student_id, "studentId"),
             "tenantId": to_oid(tenant_id, "tenantId"),
@@ -209,16 +105,35 @@ async def get_submissions_by_student(student_id: str, tenant_id: str) -> List[di
 # ---------------------------
 # GET SUBMISSIONS BY ASSIGNMENT
 # ---------------------------
-async def get_submissions_by_assignment(
-    assignment_id: str, tenant_id: str
-) -> List[dict]:
-    cursor = db.assignmentSubmissions.find(
+def get_submissions_by_assignment_cursor(assignment_id: str, tenant_id: str):
+    """Return the unconsumed cursor so the router can stream rows."""
+    return assignment_submissions_collection.find(
         {
             "assignmentId": to_oid(assignment_id, "assignmentId"),
             "tenantId": to_oid(tenant_id, "tenantId"),
         }
     ).sort("submittedAt", -1)
-    return [serialize_submission(s) async for s in cursor]
+
+
+# ---------------------------
+# GET SUBMISSIONS FOR MANY ASSIGNMENTS
+# ---------------------------
+async def get_submissions_by_assignments(
+    assignment_ids: List[str], tenant_id: str
+) -> dict:
+    """Fetch submissions for several assignments in one query, grouped by assignmentId."""
+    oids = [to_oid(a, "assignmentId") for a in assignment_ids]
+    grouped = {str(o): [] for o in oids}
+
+    cursor = assignment_submissions_collection.find(
+        {
+            "tenantId": to_oid(tenant_id, "tenantId"),
+            "assignmentId": {"$in": oids},
+        }
+    ).sort("submittedAt", -1)
+    async for s in cursor:
+        grouped[str(s["assignmentId"])].append(serialize_submission(s))
+    return grouped
 
 
 # ---------------------------
@@ -239,7 +154,7 @@ async def grade_submission(
     if feedback is not None:
         updates["feedback"] = feedback
 
-    result = await db.assignmentSubmissions.update_one(
+    result = await assignment_submissions_collection.update_one(
         {
             "_id": to_oid(submission_id, "submissionId"),
             "tenantId": to_oid(tenant_id, "tenantId"),
@@ -250,7 +165,7 @@ async def grade_submission(
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Submission not found")
 
-    doc = await db.assignmentSubmissions.find_one(
+    doc = await assignment_submissions_collection.find_one(
         {
             "_id": to_oid(submission_id, "submissionId"),
             "tenantId": to_oid(tenant_id, "tenantId"),
@@ -263,7 +178,7 @@ async def grade_submission(
 # DELETE SUBMISSION (Admin Only)
 # ---------------------------
 async def delete_submission(submission_id: str, tenant_id: str) -> bool:
-    result = await db.assignmentSubmissions.delete_one(
+    result = await assignment_submissions_collection.delete_one(
         {
             "_id": to_oid(submission_id, "submissionId"),
             "tenantId": to_oid(tenant_id, "tenantId"),
@@ -1,8 +1,11 @@
-from datetime import datetime
+import asyncio
+from datetime import datetime, timezone
 from bson import ObjectId
 from bson.errors import InvalidId
+from pymongo import ReturnDocument
 from fastapi import HTTPException
-from app.db.database import db
+from app.crud import oid
+from app.db.database import assignments_collection, courses_collection
 
 
 # ---------------------------
@@ -11,13 +14,36 @@ from app.db.database import db
 def to_oid(id_str: str, field: str = "id") -> ObjectId:
     """Convert string to ObjectId and validate."""
     try:
-        return ObjectId(id_str)
+        return oid(id_str)
     except (InvalidId, TypeError):
         raise HTTPException(status_code=400, detail=f"Invalid {field}")
 
 
-async def serialize_assignment(a: dict) -> dict:
-    """Serialize assignment document with courseName."""
+# Fields read by serialize_assignment; anything else stays on the server
+ASSIGNMENT_LIST_PROJECTION = {
+    "courseId": 1,
+    "teacherId": 1,
+    "tenantId": 1,
+    "title": 1,
+    "description": 1,
+    "dueDate": 1,
+    "dueTime": 1,
+    "uploadedAt": 1,
+    "updatedAt": 1,
+    "totalMarks": 1,
+    "passingMarks": 1,
+    "status": 1,
+    "fileUrl": 1,
+    "allowedFormats": 1,
+}
+
+
+async def serialize_assignment(a: dict, course_names: dict | None = None) -> dict:
+    """Serialize assignment document with courseName.
+
+    `course_names` maps courseId -> title when the caller has already
+    resolved them in bulk; otherwise the course is looked up here.
+    """
 
     def fix_date(value):
         if not value:
@@ -32,11 +58,15 @@ async def serialize_assignment(a: dict) -> dict:
             return value
 
     # Fetch course name
-    course = await db.courses.find_one({"_id": a["courseId"]})
-    
-    course_name = "Unknown Course"
-    if course:
-        course_name = course.get("title") or course.get("courseName") or "Unknown Course"
+    if course_names is not None:
+        course_name = course_names.get(a["courseId"]) or "Unknown Course"
+    else:
+        course = await courses_collection.find_one(
+            {"_id": a["courseId"]}, {"title": 1, "courseName": 1}
+        )
+        course_name = "Unknown Course"
+        if course:
+            course_name = course.get("title") or course.get("courseName") or "Unknown Course"
 
     return {
         "id": str(a["_id"]),
@@ -66,6 +96,7 @@ async def create_assignment(data, teacher_id: str, tenant_id: str) -> dict:
     course_oid = to_oid(data.courseId, "courseId")
     teacher_oid = to_oid(teacher_id, "teacherId")
     tenant_oid = to_oid(tenant_id, "tenantId")
+    now = datetime.now(timezone.utc)
 
     assignment = {
         "courseId": course_oid,
@@ -80,13 +111,13 @@ async def create_assignment(data, teacher_id: str, tenant_id: str) -> dict:
         "status": data.status or "active",
         "fileUrl": data.fileUrl,
         "allowedFormats": data.allowedFormats or [],
-        "uploadedAt": datetime.utcnow(),
-        "updatedAt": datetime.utcnow(),
+        "uploadedAt": now,
+        "updatedAt": now,
     }
 
-    result = await db.assignments.insert_one(assignment)
-    doc = await db.assignments.find_one({"_id": result.inserted_id})
-    return await serialize_assignment(doc)
+    # insert_one sets assignment["_id"]; serialize it directly instead of re-reading
+    await assignments_collection.insert_one(assignment)
+    return await serialize_assignment(assignment)
 
 
 # ---------------------------
@@ -135,11 +166,28 @@ async def get_all_assignments(
 
     # Pagination
     skip = max(page - 1, 0) * limit
-    cursor = db.assignments.find(query).sort(sort_by, order).skip(skip).limit(limit)
+    cursor = (
+        assignments_collection.find(query, ASSIGNMENT_LIST_PROJECTION)
+        .sort(sort_by, order)
+        .skip(skip)
+        .limit(limit)
+    )
+
+    docs, total = await asyncio.gather(
+        cursor.to_list(length=limit),
+        assignments_collection.count_documents(query),
+    )
 
-    results = [await serialize_assignment(a) async for a in cursor]
+    # Resolve course names for the whole page in one query
+    course_ids = list({a["courseId"] for a in docs})
+    course_names = {}
+    if course_ids:
+        async for c in courses_collection.find(
+            {"_id": {"$in": course_ids}}, {"title": 1, "courseName": 1}
+        ):
+            course_names[c["_id"]] = c.get("title") or c.get("courseName")
 
-    total = await db.assignments.count_documents(query)
+    results = [await serialize_assignment(a, course_names) for a in docs]
 
     return {
         "page": page,
@@ -158,7 +206,7 @@ async def get_assignment(id: str, tenant_id: str) -> dict | None:
         "_id": to_oid(id, "assignmentId"),
         "tenantId": to_oid(tenant_id, "tenantId"),
     }
-    assignment = await db.assignments.find_one(query)
+    assignment = await assignments_collection.find_one(query)
     return await serialize_assignment(assignment) if assignment else None
 
 
@@ -171,45 +219,42 @@ async def update_assignment(
     if not updates:
         raise HTTPException(status_code=400, detail="No updates provided")
 
-    # Ensure IDs
-    assignment = await db.assignments.find_one(
-        {
-            "_id": to_oid(assignment_id, "assignmentId"),
-            "tenantId": to_oid(tenant_id, "tenantId"),
-        }
-    )
-    if not assignment:
-        return None
-
-    if str(assignment["teacherId"]) != teacher_id:
-        return "UNAUTHORIZED"
-
     updates_to_set = {k: v for k, v in updates.items() if v is not None}
-    updates_to_set["updatedAt"] = datetime.utcnow()
+    updates_to_set["updatedAt"] = datetime.now(timezone.utc)
 
-    await db.assignments.update_one(
-        {"_id": to_oid(assignment_id, "assignmentId")}, {"$set": updates_to_set}
-    )
-    updated_assignment = await db.assignments.find_one(
-        {"_id": to_oid(assignment_id, "assignmentId")}
+    # Ownership is part of the filter, so the happy path is a single round-trip
+    query = {
+        "_id": to_oid(assignment_id, "assignmentId"),
+        "tenantId": to_oid(tenant_id, "tenantId"),
+    }
+    updated_assignment = await assignments_collection.find_one_and_update(
+        {**query, "teacherId": to_oid(teacher_id, "teacherId")},
+        {"$set": updates_to_set},
+        return_document=ReturnDocument.AFTER,
     )
-    return await serialize_assignment(updated_assignment)
+    if updated_assignment:
+        return await serialize_assignment(updated_assignment)
+
+    # No match: tell "not found" apart from "not yours"
+    if await assignments_collection.count_documents(query, limit=1):
+        return "UNAUTHORIZED"
+    return None
 
 
 # ---------------------------
 # DELETE ASSIGNMENT
 # ---------------------------
 async def delete_assignment(assignment_id: str, teacher_id: str, tenant_id: str):
-    assignment = await db.assignments.find_one(
-        {
-            "_id": to_oid(assignment_id, "assignmentId"),
-            "tenantId": to_oid(tenant_id, "tenantId"),
-        }
+    query = {
+        "_id": to_oid(assignment_id, "assignmentId"),
+        "tenantId": to_oid(tenant_id, "tenantId"),
+    }
+    result = await assignments_collection.delete_one(
+        {**query, "teacherId": to_oid(teacher_id, "teacherId")}
     )
-    if not assignment:
-        return None
-    if str(assignment["teacherId"]) != teacher_id:
-        return "UNAUTHORIZED"
+    if result.deleted_count:
+        return True
 
-    await db.assignments.delete_one({"_id": to_oid(assignment_id, "assignmentId")})
-    return True
+    if await assignments_collection.count_documents(query, limit=1):
+        return "UNAUTHORIZED"
+    return None
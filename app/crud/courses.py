@@ -1,9 +1,17 @@
 
+import asyncio
 from bson import ObjectId
 from datetime import datetime
 from typing import List, Optional, Dict, Any
-from app.db.database import get_courses_collection, get_students_collection, db, users_collection
+from app.db.database import (
+    get_courses_collection,
+    get_students_collection,
+    users_collection,
+    teachers_collection,
+    tenants_collection,
+)
 from app.schemas.courses import CourseCreate, CourseUpdate
+from app.utils.cache import invalidate_tenant_counts
 
 class CourseCRUD:
    
@@ -67,7 +75,7 @@ class CourseCRUD:
         Raises:
             ValueError: If tenant/teacher not found or validation fails
         """
-        course_dict = course_data.dict()
+        course_dict = course_data.model_dump()
         
         # Validate tenantId format
         if not course_dict.get("tenantId") or not ObjectId.is_valid(course_dict["tenantId"]):
@@ -80,45 +88,42 @@ class CourseCRUD:
         tenant_id = ObjectId(course_dict["tenantId"])
         teacher_id = ObjectId(course_dict["teacherId"])
         
-        # Check if tenant exists in database
-        tenant = await db.tenants.find_one({"_id": tenant_id})
+        # Look up tenant and teacher concurrently; the tenant match is checked
+        # here so a missing vs. foreign teacher needs no second query
+        tenant, teacher = await asyncio.gather(
+            tenants_collection.find_one({"_id": tenant_id}, {"_id": 1}),
+            teachers_collection.find_one({"_id": teacher_id}, {"tenantId": 1}),
+        )
         if not tenant:
             raise ValueError(f"Tenant not found with ID: {course_dict['tenantId']}")
         
         #  Check if teacher exists and belongs to the same tenant
-        teacher = await db.teachers.find_one({
-            "_id": teacher_id,
-            "tenantId": tenant_id
-        })
-        
         if not teacher:
-            # Check if teacher exists in a different tenant
-            teacher_exists = await db.teachers.find_one({"_id": teacher_id})
-            if teacher_exists:
-                raise ValueError("Teacher found but belongs to different tenant")
             raise ValueError(f"Teacher not found with ID: {course_dict['teacherId']}")
+        if teacher.get("tenantId") != tenant_id:
+            raise ValueError("Teacher found but belongs to different tenant")
         
         #  Store both IDs as ObjectId (teacherId was string before)
         course_dict["tenantId"] = tenant_id
         course_dict["teacherId"] = teacher_id
         
         # Add timestamps
-        course_dict["createdAt"] = datetime.utcnow()
-        course_dict["updatedAt"] = datetime.utcnow()
+        now = datetime.utcnow()
+        course_dict["createdAt"] = now
+        course_dict["updatedAt"] = now
         course_dict["enrolledStudents"] = 0
         
-        # Insert into MongoDB
+        # Link the course to the teacher only once the insert has succeeded
         result = await self.collection.insert_one(course_dict)
         course_id = result.inserted_id
-        
-        #  Update teacher's assignedCourses array
-        await db.teachers.update_one(
+        await teachers_collection.update_one(
             {"_id": teacher_id},
             {
                 "$addToSet": {"assignedCourses": course_id},
-                "$set": {"updatedAt": datetime.utcnow()}
+                "$set": {"updatedAt": now}
             }
         )
+        invalidate_tenant_counts(tenant_id)
         
         # Convert ObjectIds to strings for response
         course_dict["_id"] = str(course_id)
@@ -127,13 +132,20 @@ class CourseCRUD:
         
         return course_dict
 
-    def _get_enriched_courses_pipeline(self, query: Dict[str, Any], skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    def _get_enriched_courses_pipeline(
+        self,
+        query: Dict[str, Any],
+        skip: int = 0,
+        limit: int = 100,
+        sort: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Creates a centralized aggregation pipeline for enriching course data with 
         instructor names from the users collection.
         """
         return [
             {"$match": query},
+            *([{"$sort": sort}] if sort else []),
             {"$addFields": {
                 "teacherId": {"$toObjectId": "$teacherId"}
             }},
@@ -209,7 +221,8 @@ class CourseCRUD:
     ) -> dict:
         """
         Retrieves a list of courses filtered by tenant, teacher, status, etc.
-        Supports regex search on title, description, category, and course code.
+        Supports text search on title, description, category, and course code,
+        ranked by relevance.
         
         Returns:
             A dictionary with results, total count, and metadata.
@@ -248,19 +261,15 @@ class CourseCRUD:
             category = category.strip()
             query["category"] = {"$regex": f"^{category}$", "$options": "i"}
         
-        # Add broad text search across multiple fields
-        if search:
-            search = search.strip()
-            query["$or"] = [
-                {"title": {"$regex": search, "$options": "i"}},
-                {"description": {"$regex": search, "$options": "i"}},
-                {"category": {"$regex": search, "$options": "i"}},
-                {"courseCode": {"$regex": search, "$options": "i"}}
-            ]
+        # Add broad text search across multiple fields (served by the courses text index)
+        sort = None
+        if search and search.strip():
+            query["$text"] = {"$search": search.strip()}
+            sort = {"score": {"$meta": "textScore"}}
         
         try:
             # Pipeline for aggregation with lookups
-            pipeline = self._get_enriched_courses_pipeline(query, skip, limit)
+            pipeline = self._get_enriched_courses_pipeline(query, skip, limit, sort)
 
             # Execute query
             total = await self.collection.count_documents(query)
@@ -318,7 +327,7 @@ class CourseCRUD:
         old_teacher_id = existing_course.get("teacherId")
 
         # Convert schema to dict and remove unset fields
-        update_data = course_update.dict(exclude_unset=True)
+        update_data = course_update.model_dump(exclude_unset=True)
         cleaned_data = await self.clean_update_data(update_data)
         
         # If no valid updates after cleaning, just return current state
@@ -353,12 +362,12 @@ class CourseCRUD:
             if new_teacher_id and str(old_teacher_id) != str(new_teacher_id):
                 # Remove from old
                 if old_teacher_id:
-                    await db.teachers.update_one(
+                    await teachers_collection.update_one(
                         {"_id": old_teacher_id},
                         {"$pull": {"assignedCourses": ObjectId(course_id)}}
                     )
                 # Add to new
-                await db.teachers.update_one(
+                await teachers_collection.update_one(
                     {"_id": new_teacher_id},
                     {"$addToSet": {"assignedCourses": ObjectId(course_id)}}
                 )
@@ -429,13 +438,14 @@ class CourseCRUD:
     })
     
      if delete_result.deleted_count > 0:
+        invalidate_tenant_counts(tenant_obj_id)
         #  Remove course from teacher's assignedCourses array
         if teacher_id:
             # Ensure teacher_id is ObjectId
             if isinstance(teacher_id, str):
                 teacher_id = ObjectId(teacher_id)
             
-            teacher_update_result = await db.teachers.update_one(
+            teacher_update_result = await teachers_collection.update_one(
                 {"_id": teacher_id},
                 {
                     "$pull": {"assignedCourses": course_obj_id},
@@ -467,6 +477,38 @@ class CourseCRUD:
         "message": "Failed to delete course"
     }
 
+    async def _load_course_and_student(
+        self, course_id: str, student_id: str, tenant_object_id: ObjectId
+    ) -> tuple:
+        """
+        Fetch course and student concurrently for (un)enrollment.
+        Tenant ownership is compared here so "not found" vs "other tenant"
+        needs no follow-up query.
+        
+        Returns:
+            (student, None) on success, or (None, error_dict).
+        """
+        course, student = await asyncio.gather(
+            self.collection.find_one({"_id": ObjectId(course_id)}, {"tenantId": 1}),
+            self.students_collection.find_one(
+                {"_id": ObjectId(student_id)}, {"tenantId": 1, "enrolledCourses": 1}
+            ),
+        )
+        
+        # Verify course exists and belongs to tenant
+        if not course:
+            return None, {"success": False, "message": f"Course not found with ID: {course_id}"}
+        if course.get("tenantId") != tenant_object_id:
+            return None, {"success": False, "message": "Course found but belongs to different tenant"}
+        
+        # Verify student exists and belongs to tenant
+        if not student:
+            return None, {"success": False, "message": f"Student not found with ID: {student_id}"}
+        if student.get("tenantId") != tenant_object_id:
+            return None, {"success": False, "message": "Student found but belongs to different tenant"}
+        
+        return student, None
+
     async def enroll_student(self, course_id: str, student_id: str, tenantId: str) -> dict:
         """
         Enrolls a student in a course.
@@ -489,51 +531,34 @@ class CourseCRUD:
         
         tenant_object_id = ObjectId(tenantId)
         
-        # Verify course exists and belongs to tenant
-        course = await self.collection.find_one({
-            "_id": ObjectId(course_id),
-            "tenantId": tenant_object_id
-        })
-        
-        if not course:
-            course_exists = await self.collection.find_one({"_id": ObjectId(course_id)})
-            if course_exists:
-                return {"success": False, "message": "Course found but belongs to different tenant"}
-            return {"success": False, "message": f"Course not found with ID: {course_id}"}
-        
-        # Verify student exists and belongs to tenant
-        student = await self.students_collection.find_one({
-            "_id": ObjectId(student_id),
-            "tenantId": tenant_object_id
-        })
-        
-        if not student:
-            student_exists = await self.students_collection.find_one({"_id": ObjectId(student_id)})
-            if student_exists:
-                return {"success": False, "message": "Student found but belongs to different tenant"}
-            return {"success": False, "message": f"Student not found with ID: {student_id}"}
+        student, error = await self._load_course_and_student(
+            course_id, student_id, tenant_object_id
+        )
+        if error:
+            return error
         
         # Prevention: Already enrolled check
         enrolled_courses = student.get("enrolledCourses", [])
         if course_id in enrolled_courses:
             return {"success": False, "message": "Student is already enrolled in this course"}
         
-        # Update 1: Student document
-        await self.students_collection.update_one(
-            {"_id": ObjectId(student_id), "tenantId": tenant_object_id},
-            {
-                "$addToSet": {"enrolledCourses": course_id},
-                "$set": {"updatedAt": datetime.utcnow()}
-            }
-        )
-        
-        # Update 2: Course counter
-        await self.collection.update_one(
-            {"_id": ObjectId(course_id), "tenantId": tenant_object_id},
-            {
-                "$inc": {"enrolledStudents": 1},
-                "$set": {"updatedAt": datetime.utcnow()}
-            }
+        # Update student document and course counter together
+        now = datetime.utcnow()
+        await asyncio.gather(
+            self.students_collection.update_one(
+                {"_id": ObjectId(student_id), "tenantId": tenant_object_id},
+                {
+                    "$addToSet": {"enrolledCourses": course_id},
+                    "$set": {"updatedAt": now}
+                }
+            ),
+            self.collection.update_one(
+                {"_id": ObjectId(course_id), "tenantId": tenant_object_id},
+                {
+                    "$inc": {"enrolledStudents": 1},
+                    "$set": {"updatedAt": now}
+                }
+            ),
         )
         
         return {"success": True, "message": "Successfully enrolled in course"}
@@ -563,53 +588,34 @@ class CourseCRUD:
         # Convert tenantId to ObjectId
         tenant_object_id = ObjectId(tenantId)
         
-        # Check if course exists (with tenant isolation)
-        course = await self.collection.find_one({
-            "_id": ObjectId(course_id),
-            "tenantId": tenant_object_id
-        })
-        
-        if not course:
-            # Check if course exists in a different tenant
-            course_exists = await self.collection.find_one({"_id": ObjectId(course_id)})
-            if course_exists:
-                return {"success": False, "message": "Course found but belongs to different tenant"}
-            return {"success": False, "message": f"Course not found with ID: {course_id}"}
-        
-        # Check if student exists (with tenant isolation)
-        student = await self.students_collection.find_one({
-            "_id": ObjectId(student_id),
-            "tenantId": tenant_object_id
-        })
-        
-        if not student:
-            # Check if student exists in a different tenant
-            student_exists = await self.students_collection.find_one({"_id": ObjectId(student_id)})
-            if student_exists:
-                return {"success": False, "message": "Student found but belongs to different tenant"}
-            return {"success": False, "message": f"Student not found with ID: {student_id}"}
+        student, error = await self._load_course_and_student(
+            course_id, student_id, tenant_object_id
+        )
+        if error:
+            return error
         
         # Check if student is actually enrolled in this course
         enrolled_courses = student.get("enrolledCourses", [])
         if course_id not in enrolled_courses:
             return {"success": False, "message": "Student is not enrolled in this course"}
         
-        # Remove course from student's enrolledCourses array
-        await self.students_collection.update_one(
-            {"_id": ObjectId(student_id), "tenantId": tenant_object_id},
-            {
-                "$pull": {"enrolledCourses": course_id},
-                "$set": {"updatedAt": datetime.utcnow()}
-            }
-        )
-        
-        # Decrement the course's enrolled student count by 1
-        await self.collection.update_one(
-            {"_id": ObjectId(course_id), "tenantId": tenant_object_id},
-            {
-                "$inc": {"enrolledStudents": -1},
-                "$set": {"updatedAt": datetime.utcnow()}
-            }
+        # Pull from student's enrolledCourses and decrement the course count together
+        now = datetime.utcnow()
+        await asyncio.gather(
+            self.students_collection.update_one(
+                {"_id": ObjectId(student_id), "tenantId": tenant_object_id},
+                {
+                    "$pull": {"enrolledCourses": course_id},
+                    "$set": {"updatedAt": now}
+                }
+            ),
+            self.collection.update_one(
+                {"_id": ObjectId(course_id), "tenantId": tenant_object_id},
+                {
+                    "$inc": {"enrolledStudents": -1},
+                    "$set": {"updatedAt": now}
+                }
+            ),
         )
         
         return {"success": True, "message": "Successfully unenrolled from course"}
@@ -1,87 +1,162 @@
+import asyncio
+
 from bson import ObjectId
-from app.db.database import db
+from app.db.database import courses_collection, students_collection, teachers_collection
+from app.utils.cache import tenant_counts_cache
+
+# Only the fields each dashboard row is built from
+STUDENT_PROJECTION = {"userId": 1, "enrolledCourses": 1, "completedCourses": 1}
+TEACHER_PROJECTION = {
+    "userId": 1,
+    "assignedCourses": 1,
+    "qualifications": 1,
+    "subjects": 1,
+}
+COURSE_PROJECTION = {
+    "title": 1,
+    "courseCode": 1,
+    "description": 1,
+    "category": 1,
+    "status": 1,
+    "duration": 1,
+    "enrolledStudents": 1,
+    "teacherId": 1,
+    "tenantId": 1,
+}
+
+
+def _user_join(user_fields: dict) -> list:
+    """Stages that attach the linked user as `user`, dropping profiles without one."""
+    return [
+        {
+            "$lookup": {
+                "from": "users",
+                "localField": "userId",
+                "foreignField": "_id",
+                "pipeline": [{"$project": user_fields}],
+                "as": "user",
+            }
+        },
+        {"$unwind": "$user"},
+    ]
 
 
-async def get_all_students(tenant_id: str):
-    students = []
+def _page_facet(projection: dict, skip: int, limit: int) -> dict:
+    """Page slice and total count from the same aggregation.
 
-    if not tenant_id or not ObjectId.is_valid(tenant_id):
-        return []
-
-    tenant_oid = ObjectId(tenant_id)
-    async for s in db.students.find({"tenantId": tenant_oid}):
-        user = await db.users.find_one({"_id": s["userId"]})
-
-        if not user:
-            continue
-
-        # Merge user data directly into student object
-        students.append(
-            {
-                "id": str(s["_id"]),
-                "fullName": user.get("fullName", ""),
-                "email": user.get("email", ""),
-                "status": user.get("status", "active"),
-                "country": user.get("country"),
-                "enrolledCourses": s.get("enrolledCourses", []),
-                "completedCourses": s.get("completedCourses", []),
-            }
-        )
+    $facet returns a single document (16MB cap), so the slice is always bounded.
+    """
+    items = [{"$skip": skip}] if skip else []
+    items.append({"$limit": limit})
+    items.append({"$project": projection})
+    return {"$facet": {"items": items, "total": [{"$count": "n"}]}}
 
-    return students
 
+async def _run_facet(collection, pipeline: list) -> tuple[int, list]:
+    result = await collection.aggregate(pipeline).to_list(length=1)
+    facet = result[0] if result else {"items": [], "total": []}
+    total = facet["total"][0]["n"] if facet["total"] else 0
+    return total, facet["items"]
 
-async def get_all_teachers(tenant_id: str):
-    teachers = []
 
+async def get_counts(tenant_id: str):
+    """Per-tenant totals, cached briefly and invalidated (per process) on teacher/student/course create/delete."""
     if not tenant_id or not ObjectId.is_valid(tenant_id):
-        return []
-
-    tenant_oid = ObjectId(tenant_id)
-    async for t in db.teachers.find({"tenantId": tenant_oid}):
-        user = await db.users.find_one({"_id": t["userId"]})
-
-        if not user:
-            continue
-
-        # Merge user data directly into teacher object
-        teachers.append(
-            {
-                "id": str(t["_id"]),
-                "fullName": user.get("fullName", ""),
-                "email": user.get("email", ""),
-                "status": user.get("status", "active"),
-                "role": user.get("role", "teacher"),
-                "assignedCourses": [str(c) for c in t.get("assignedCourses", [])],
-                "qualifications": t.get("qualifications", []),
-                "subjects": t.get("subjects", []),
-            }
-        )
+        return {"teachers": 0, "students": 0, "courses": 0}
 
-    return teachers
+    cached = tenant_counts_cache.get(tenant_id)
+    if cached is not None:
+        return cached
 
+    query = {"tenantId": ObjectId(tenant_id)}
+    teachers, students, courses = await asyncio.gather(
+        teachers_collection.count_documents(query),
+        students_collection.count_documents(query),
+        courses_collection.count_documents(query),
+    )
+    counts = {"teachers": teachers, "students": students, "courses": courses}
+    tenant_counts_cache.set(tenant_id, counts)
+    return counts
 
-async def get_all_courses(tenant_id: str):
-    courses = []
 
+async def get_all_students(tenant_id: str, skip: int = 0, limit: int = 100):
     if not tenant_id or not ObjectId.is_valid(tenant_id):
-        return []
-
-    tenant_oid = ObjectId(tenant_id)
-    async for c in db.courses.find({"tenantId": tenant_oid}):
-        courses.append(
-            {
-                "id": str(c["_id"]),
-                "title": c.get("title", ""),
-                "courseCode": c.get("courseCode", ""),
-                "description": c.get("description", ""),
-                "category": c.get("category", ""),
-                "status": c.get("status", ""),
-                "duration": c.get("duration", ""),
-                "enrolledStudents": c.get("enrolledStudents", 0),
-                "teacherId": str(c.get("teacherId", "")),
-                "tenantId": str(c.get("tenantId", "")),
-            }
-        )
-
-    return courses
+        return {"total": 0, "students": []}
+
+    pipeline = [
+        {"$match": {"tenantId": ObjectId(tenant_id)}},
+        *_user_join({"fullName": 1, "email": 1, "status": 1, "country": 1}),
+        _page_facet({**STUDENT_PROJECTION, "user": 1}, skip, limit),
+    ]
+    total, docs = await _run_facet(students_collection, pipeline)
+
+    # Merge user data directly into student object
+    students = [
+        {
+            "id": str(s["_id"]),
+            "fullName": s["user"].get("fullName", ""),
+            "email": s["user"].get("email", ""),
+            "status": s["user"].get("status", "active"),
+            "country": s["user"].get("country"),
+            "enrolledCourses": s.get("enrolledCourses", []),
+            "completedCourses": s.get("completedCourses", []),
+        }
+        for s in docs
+    ]
+    return {"total": total, "students": students}
+
+
+async def get_all_teachers(tenant_id: str, skip: int = 0, limit: int = 100):
+    if not tenant_id or not ObjectId.is_valid(tenant_id):
+        return {"total": 0, "teachers": []}
+
+    pipeline = [
+        {"$match": {"tenantId": ObjectId(tenant_id)}},
+        *_user_join({"fullName": 1, "email": 1, "status": 1, "role": 1}),
+        _page_facet({**TEACHER_PROJECTION, "user": 1}, skip, limit),
+    ]
+    total, docs = await _run_facet(teachers_collection, pipeline)
+
+    # Merge user data directly into teacher object
+    teachers = [
+        {
+            "id": str(t["_id"]),
+            "fullName": t["user"].get("fullName", ""),
+            "email": t["user"].get("email", ""),
+            "status": t["user"].get("status", "active"),
+            "role": t["user"].get("role", "teacher"),
+            "assignedCourses": [str(c) for c in t.get("assignedCourses", [])],
+            "qualifications": t.get("qualifications", []),
+            "subjects": t.get("subjects", []),
+        }
+        for t in docs
+    ]
+    return {"total": total, "teachers": teachers}
+
+
+async def get_all_courses(tenant_id: str, skip: int = 0, limit: int = 100):
+    if not tenant_id or not ObjectId.is_valid(tenant_id):
+        return {"total": 0, "courses": []}
+
+    pipeline = [
+        {"$match": {"tenantId": ObjectId(tenant_id)}},
+        _page_facet(COURSE_PROJECTION, skip, limit),
+    ]
+    total, docs = await _run_facet(courses_collection, pipeline)
+
+    courses = [
+        {
+            "id": str(c["_id"]),
+            "title": c.get("title", ""),
+            "courseCode": c.get("courseCode", ""),
+            "description": c.get("description", ""),
+            "category": c.get("category", ""),
+            "status": c.get("status", ""),
+            "duration": c.get("duration", ""),
+            "enrolledStudents": c.get("enrolledStudents", 0),
+            "teacherId": str(c.get("teacherId", "")),
+            "tenantId": str(c.get("tenantId", "")),
+        }
+        for c in docs
+    ]
+    return {"total": total, "courses": courses}
@@ -1,6 +1,6 @@
 from bson import ObjectId
 from datetime import datetime
-from app.db.database import db
+from app.db.database import quiz_submissions_collection, quizzes_collection
 from typing import Optional, Tuple
 
 # --- helper: serialize submission for API ---
@@ -34,7 +34,7 @@ async def submit_and_grade_submission(payload):
     5) return serialized submission
     """
     # Convert request model -> dict
-    data = payload.dict()
+    data = payload.model_dump()
 
     # Convert ID strings to ObjectId for DB storage/queries
     data.update({
@@ -47,7 +47,7 @@ async def submit_and_grade_submission(payload):
     })
 
     # Prevent duplicate submission (optional policy)
-    existing = await db.quizSubmissions.find_one({
+    existing = await quiz_submissions_collection.find_one({
         "studentId": data["studentId"],
         "quizId": data["quizId"]
     })
@@ -56,14 +56,14 @@ async def submit_and_grade_submission(payload):
         return "AlreadySubmitted"
 
     # Insert the raw submission first
-    res = await db.quizSubmissions.insert_one(data)
-    submission_doc = await db.quizSubmissions.find_one({"_id": res.inserted_id})
+    res = await quiz_submissions_collection.insert_one(data)
+    submission_doc = await quiz_submissions_collection.find_one({"_id": res.inserted_id})
 
     # Fetch the quiz document to grade
-    quiz = await db.quizzes.find_one({"_id": ObjectId(data["quizId"])})
+    quiz = await quizzes_collection.find_one({"_id": ObjectId(data["quizId"])})
     if not quiz:
         # If quiz not found, mark submission as failed (should ideally never happen)
-        await db.quizSubmissions.update_one(
+        await quiz_submissions_collection.update_one(
             {"_id": res.inserted_id},
             {"$set": {"status": "error", "percentage": None, "obtainedMarks": None}}
         )
@@ -77,7 +77,7 @@ async def submit_and_grade_submission(payload):
     percentage = round(percentage, 2)
 
     # Update the submission document with grading results
-    await db.quizSubmissions.update_one(
+    await quiz_submissions_collection.update_one(
         {"_id": res.inserted_id},
         {"$set": {
             "obtainedMarks": obtained_marks,
@@ -89,7 +89,7 @@ async def submit_and_grade_submission(payload):
     )
 
     # Fetch updated submission and return serialized
-    updated = await db.quizSubmissions.find_one({"_id": res.inserted_id})
+    updated = await quiz_submissions_collection.find_one({"_id": res.inserted_id})
     return serialize_submission(updated)
 
 
@@ -189,11 +189,11 @@ async def get_quiz_summary(quiz_id: str, top_n: int = 5):
             }
         }
     ]
-    basic = await db.quizSubmissions.aggregate(pipeline).to_list(length=1)
+    basic = await quiz_submissions_collection.aggregate(pipeline).to_list(length=1)
     basic_stats = basic[0] if basic else {"totalAttempts": 0, "avgPercentage": None, "avgMarks": None}
 
     # top N scores
-    top_cursor = db.quizSubmissions.find(
+    top_cursor = quiz_submissions_collection.find(
         {"quizId": q_oid, "status": "graded"},
         {"studentId": 1, "obtainedMarks": 1, "percentage": 1}
     ).sort("obtainedMarks", -1).limit(top_n)
@@ -214,7 +214,7 @@ async def get_quiz_summary(quiz_id: str, top_n: int = 5):
             "total": {"$sum": 1}
         }}
     ]
-    pass_result = await db.quizSubmissions.aggregate(pass_pipeline).to_list(length=1)
+    pass_result = await quiz_submissions_collection.aggregate(pass_pipeline).to_list(length=1)
     pass_stats = pass_result[0] if pass_result else {"passCount": 0, "total": 0}
     pass_rate = (pass_stats["passCount"] / pass_stats["total"] * 100) if pass_stats["total"] else 0.0
 
@@ -228,7 +228,7 @@ async def get_quiz_summary(quiz_id: str, top_n: int = 5):
             "output": {"count": {"$sum": 1}}
         }}
     ]
-    bucket_results = await db.quizSubmissions.aggregate(buckets_pipeline).to_list(length=20)
+    bucket_results = await quiz_submissions_collection.aggregate(buckets_pipeline).to_list(length=20)
     # convert bucket results to friendly dict
     distribution = {str(b["_id"]): b["count"] for b in bucket_results}
 
@@ -264,11 +264,11 @@ async def get_student_analytics(student_id: str, recent: int = 5):
             "avgPercentage": {"$avg": "$percentage"}
         }}
     ]
-    agg = await db.quizSubmissions.aggregate(pipeline).to_list(length=1)
+    agg = await quiz_submissions_collection.aggregate(pipeline).to_list(length=1)
     stats = agg[0] if agg else {"totalTaken": 0, "avgPercentage": None}
 
     # recent attempts
-    recent_cursor = db.quizSubmissions.find(
+    recent_cursor = quiz_submissions_collection.find(
         {"studentId": s_oid, "status": "graded"},
         {"quizId": 1, "percentage": 1, "submittedAt": 1}
     ).sort("submittedAt", -1).limit(recent)
@@ -306,7 +306,7 @@ async def get_teacher_dashboard(teacher_id: str, course_id: Optional[str] = None
         quiz_query["courseId"] = ObjectId(course_id)
 
     # fetch quiz ids
-    quiz_cursor = db.quizzes.find(quiz_query, {"_id": 1, "quizNumber": 1, "courseId": 1})
+    quiz_cursor = quizzes_collection.find(quiz_query, {"_id": 1, "quizNumber": 1, "courseId": 1})
     quiz_list = []
     quiz_ids = []
     async for q in quiz_cursor:
@@ -327,13 +327,13 @@ async def get_teacher_dashboard(teacher_id: str, course_id: Optional[str] = None
             "passCount": {"$sum": {"$cond": [{"$gte": ["$percentage", 50]}, 1, 0]}}
         }}
     ]
-    agg_results = await db.quizSubmissions.aggregate(agg_pipeline).to_list(length=len(quiz_ids))
+    agg_results = await quiz_submissions_collection.aggregate(agg_pipeline).to_list(length=len(quiz_ids))
 
     # map results by quizId string
     agg_map = {str(r["_id"]): r for r in agg_results}
 
     # pending submissions count (status != graded)
-    pending_count = await db.quizSubmissions.count_documents({"quizId": {"$in": quiz_ids}, "status": {"$ne": "graded"}})
+    pending_count = await quiz_submissions_collection.count_documents({"quizId": {"$in": quiz_ids}, "status": {"$ne": "graded"}})
 
     # build final per-quiz entries
     quizzes_summary = []
@@ -365,7 +365,7 @@ async def get_by_quiz(quiz_id, sort=None):
     query = {"quizId": ObjectId(quiz_id)}
 
     # Get cursor from MongoDB
-    cursor = db.quizSubmissions.find(query)
+    cursor = quiz_submissions_collection.find(query)
 
     # Apply sorting if provided (?sort=submittedAt or ?sort=-submittedAt)
     if sort:
@@ -379,7 +379,7 @@ async def get_by_student(student_id, sort=None):
     """ Fetch submissions for a specific student """
 
     query = {"studentId": ObjectId(student_id)}
-    cursor = db.quizSubmissions.find(query)
+    cursor = quiz_submissions_collection.find(query)
 
     if sort:
         cursor = cursor.sort(sort)
@@ -390,7 +390,7 @@ async def get_by_student(student_id, sort=None):
 async def delete_submission(_id):
     """ Delete a submission by ID """
 
-    result = await db.quizSubmissions.delete_one({"_id": ObjectId(_id)})
+    result = await quiz_submissions_collection.delete_one({"_id": ObjectId(_id)})
 
     # Return True only if 1 document was deleted
     return result.deleted_count > 0
\ No newline at end of file
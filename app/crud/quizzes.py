@@ -1,10 +1,16 @@
+import base64
+import json
 from typing import Optional, Any
 
 from bson import ObjectId
 from datetime import datetime
 
 from fastapi import HTTPException, status
-from app.db.database import db
+from app.db.database import (
+    quiz_submissions_collection,
+    quizzes_collection,
+    students_collection,
+)
 
 def _ensure_objectid(_id: str, name: str = "id"):
     if not ObjectId.is_valid(_id):
@@ -43,7 +49,7 @@ async def create_quiz(request):
     """Insert a new quiz into MongoDB."""
 
     # Convert Pydantic model → Python dict
-    data = request.dict()
+    data = request.model_dump()
 
     # Convert IDs
     data["courseId"] = _ensure_objectid(data["courseId"], "courseId")
@@ -62,13 +68,10 @@ async def create_quiz(request):
         "deletedAt": None
     })
 
-    # Insert into MongoDB
-    res = await db.quizzes.insert_one(data)
+    # Insert into MongoDB; insert_one sets data["_id"], so no read-back is needed
+    await quizzes_collection.insert_one(data)
 
-    # Fetch inserted document
-    new_quiz = await db.quizzes.find_one({"_id": res.inserted_id})
-
-    return serialize_quiz(new_quiz)
+    return serialize_quiz(data)
 
 
 async def get_quiz(_id: str):
@@ -76,10 +79,65 @@ async def get_quiz(_id: str):
 
     _id = _ensure_objectid(_id, "quizId")
 
-    quiz = await db.quizzes.find_one({"_id": _id, "isDeleted": False})
+    quiz = await quizzes_collection.find_one({"_id": _id, "isDeleted": False})
     return serialize_quiz(quiz) if quiz else None
 
 
+def _encode_quiz_cursor(quiz: dict) -> str:
+    """Opaque keyset cursor pointing just past `quiz` in createdAt order."""
+    # Legacy quizzes may lack createdAt; those cursors seek on _id alone
+    created = quiz.get("createdAt")
+    raw = json.dumps(
+        {"_id": str(quiz["_id"]), "createdAt": created.isoformat() if created else None}
+    ).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_quiz_cursor(cursor: str) -> tuple[Optional[datetime], ObjectId]:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        created = data["createdAt"]
+        return (
+            datetime.fromisoformat(created) if created else None,
+            ObjectId(data["_id"]),
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def _quiz_seek_filter(
+    last_created: Optional[datetime], last_id: ObjectId, sort_dir: int
+) -> dict:
+    """
+    Match the quizzes that sort after (last_created, last_id) in
+    (createdAt, _id) order. A missing createdAt sorts below every date,
+    so undated quizzes come last when descending and first when ascending.
+    """
+    op = "$lt" if sort_dir == -1 else "$gt"
+    if last_created is not None:
+        seek = [
+            {"createdAt": {op: last_created}},
+            {"createdAt": last_created, "_id": {op: last_id}},
+        ]
+        if sort_dir == -1:
+            # Undated quizzes still follow the last dated one
+            seek.append({"createdAt": None})
+        return {"$or": seek}
+    if sort_dir == -1:
+        # Already among the undated quizzes; only older _ids remain
+        return {"createdAt": None, "_id": {op: last_id}}
+    # Undated quizzes come first ascending; every dated quiz follows
+    return {
+        "$or": [
+            {"createdAt": {"$ne": None}},
+            {"createdAt": None, "_id": {op: last_id}},
+        ]
+    }
+
+
 async def get_quizzes_filtered(
     tenantId: Optional[str] = None,
     teacherId: Optional[str] = None,
@@ -87,14 +145,20 @@ async def get_quizzes_filtered(
     search: Optional[str] = None,
     sort: Optional[str] = "createdAt",
     page: int = 1,
-    limit: int = 10
+    limit: int = 10,
+    cursor: Optional[str] = None,
 ):
     """
     Fetch quizzes with:
     - Filtering by tenant / teacher / course
     - Text search on description
     - Sorting (ASC / DESC)
-    - Pagination
+    - Pagination: keyset via `cursor` when sorting on createdAt,
+      skip/limit by `page` otherwise
+
+    Returns (quizzes, next_cursor); next_cursor is None on the last page
+    or when sorting on a field other than createdAt. Without a cursor,
+    `page` still offsets the createdAt listing so older clients keep working.
     """
 
     query: dict[str, Any] = {"isDeleted": False}
@@ -117,16 +181,38 @@ async def get_quizzes_filtered(
     sort_dir = -1 if sort.startswith("-") else 1
     sort_field = sort.lstrip("-")
 
-    # Apply filtering, sorting, pagination
-    cursor = (
-        db.quizzes.find(query)
-        .sort(sort_field, sort_dir)
-        .skip((page - 1) * limit)
-        .limit(limit)
+    if sort_field != "createdAt":
+        # No stable key to seek on; keep offset pagination
+        docs = (
+            quizzes_collection.find(query)
+            .sort(sort_field, sort_dir)
+            .skip((page - 1) * limit)
+            .limit(limit)
+        )
+        return [serialize_quiz(q) async for q in docs], None
+
+    # Keyset pagination: seek past the last seen (createdAt, _id) pair
+    if cursor:
+        query.update(_quiz_seek_filter(*_decode_quiz_cursor(cursor), sort_dir))
+        skip = 0
+    else:
+        skip = (page - 1) * limit
+
+    # Fetch one extra row to know whether another page exists
+    docs = await (
+        quizzes_collection.find(query)
+        .sort([("createdAt", sort_dir), ("_id", sort_dir)])
+        .skip(skip)
+        .limit(limit + 1)
+        .to_list(length=limit + 1)
     )
 
-    # Convert to list of serialized quizzes
-    return [serialize_quiz(q) async for q in cursor]
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = _encode_quiz_cursor(docs[-1])
+
+    return [serialize_quiz(q) for q in docs], next_cursor
 
 async def update_quiz(_id: str, teacherId: str, updates: dict):
     """
@@ -141,7 +227,7 @@ async def update_quiz(_id: str, teacherId: str, updates: dict):
     _ensure_objectid(_id, "quizId")
     teacherId = str(teacherId)
 
-    quiz = await db.quizzes.find_one({"_id": ObjectId(_id), "isDeleted": False})
+    quiz = await quizzes_collection.find_one({"_id": ObjectId(_id), "isDeleted": False})
     if not quiz:
         return None
 
@@ -150,7 +236,7 @@ async def update_quiz(_id: str, teacherId: str, updates: dict):
         return "Unauthorized"
 
     # Check if any student submissions exist for this quiz
-    submission_count = await db.quizSubmissions.count_documents({"quizId": ObjectId(_id)})
+    submission_count = await quiz_submissions_collection.count_documents({"quizId": ObjectId(_id)})
     has_submissions = submission_count > 0
 
     # filter only meaningful values
@@ -176,10 +262,10 @@ async def update_quiz(_id: str, teacherId: str, updates: dict):
     safe_updates["updatedAt"] = datetime.utcnow()
 
     # apply only safe values
-    await db.quizzes.update_one({"_id": ObjectId(_id)}, {"$set": safe_updates})
+    await quizzes_collection.update_one({"_id": ObjectId(_id)}, {"$set": safe_updates})
 
     # Fetch updated quiz
-    updated_quiz = await db.quizzes.find_one({"_id": ObjectId(_id)})
+    updated_quiz = await quizzes_collection.find_one({"_id": ObjectId(_id)})
 
     return serialize_quiz(updated_quiz)
 
@@ -187,7 +273,7 @@ async def update_quiz(_id: str, teacherId: str, updates: dict):
 async def delete_quiz(_id, teacherId):
     """ Delete quiz only if teacher owns it. """
 
-    quiz = await db.quizzes.find_one({"_id": ObjectId(_id), "isDeleted": False})
+    quiz = await quizzes_collection.find_one({"_id": ObjectId(_id), "isDeleted": False})
 
     if not quiz:
         return None
@@ -197,7 +283,7 @@ async def delete_quiz(_id, teacherId):
         return "Unauthorized"
 
     # Soft delete
-    await db.quizzes.update_one(
+    await quizzes_collection.update_one(
         {"_id": ObjectId(_id)},
         {
             "$set": {
@@ -218,7 +304,7 @@ async def has_quiz_submissions(quiz_id: str) -> bool:
     Returns True if at least one submission exists.
     """
     _ensure_objectid(quiz_id, "quizId")
-    count = await db.quizSubmissions.count_documents({"quizId": ObjectId(quiz_id)})
+    count = await quiz_submissions_collection.count_documents({"quizId": ObjectId(quiz_id)})
     return count > 0
 
 
@@ -228,11 +314,11 @@ async def get_student_quizzes(user_id: str, tenant_id: str):
     """
     # 1. Find Student Profile by User ID
     # We need to access the students collection directly or import logic
-    # To avoid circular imports, simpler to just access db.students
+    # To avoid circular imports, simpler to just access students_collection
     user_oid = _ensure_objectid(user_id, "userId")
     tenant_oid = _ensure_objectid(tenant_id, "tenantId")
 
-    student = await db.students.find_one({"userId": user_oid, "tenantId": tenant_oid})
+    student = await students_collection.find_one({"userId": user_oid, "tenantId": tenant_oid})
     if not student:
         return [] # Or raise error
 
@@ -244,7 +330,7 @@ async def get_student_quizzes(user_id: str, tenant_id: str):
         return []
 
     # 2. Query Quizzes in those courses
-    cursor = db.quizzes.find({
+    cursor = quizzes_collection.find({
         "courseId": {"$in": course_ids},
         "tenantId": tenant_oid,
         "isDeleted": False,
@@ -1,11 +1,13 @@
+import asyncio
 from datetime import datetime
 from bson import ObjectId
 from fastapi import HTTPException
 from app.schemas.students import StudentCreate, StudentUpdate
 from app.utils.mongo import fix_object_ids
 from app.utils.security import hash_password
-from app.db.database import students_collection as COLLECTION
-from app.db.database import courses_collection, users_collection, db
+from app.utils.cache import invalidate_tenant_counts, invalidate_user
+from app.db.database import students_collection as COLLECTION, tenants_collection
+from app.db.database import courses_collection, users_collection
 from app.db.database import student_performance_collection
 
 
@@ -32,31 +34,14 @@ def merge_user_data(student_doc, user_doc):
     return fix_object_ids(merged)
 
 
-# ---------------------------------------------------------------------------
-# Create Student (Multi-Tenant)
-# ---------------------------------------------------------------------------
-async def create_student(student: StudentCreate, tenant_id: str):
-    data = student.dict()
-
-    # Check if user exists
-    existing_user = await users_collection.find_one({"email": data["email"]})
-    if existing_user:
-        raise HTTPException(
-            status_code=400, detail="User with this email already exists"
-        )
-
-    # 0. Check if tenant exists
-    tenant = await db.tenants.find_one({"_id": ObjectId(tenant_id)})
-    if not tenant:
-        raise HTTPException(
-            status_code=404, detail=f"Tenant not found with ID: {tenant_id}"
-        )
-
+# ------------------ Helper: Build Student Documents ------------------ #
+def _build_student_docs(data: dict, tenant_id: str, hashed_password: str):
+    """User, student profile and performance docs for one new student."""
     # 1. Create USER document
     user_doc = {
         "fullName": data["fullName"],
         "email": data["email"].lower(),
-        "password": hash_password(data["password"]),
+        "password": hashed_password,
         "role": "student",
         "status": data.get("status", "active"),
         "profileImageURL": data.get("profileImageURL", ""),
@@ -68,11 +53,14 @@ async def create_student(student: StudentCreate, tenant_id: str):
         "lastLogin": None,
     }
 
-    user_result = await users_collection.insert_one(user_doc)
-    user_id = user_result.inserted_id
+    # IDs are generated up front so the profile docs can reference the user
+    user_id = ObjectId()
+    student_id = ObjectId()
+    user_doc["_id"] = user_id
 
     # 2. Create STUDENT document (Profile)
     student_doc = {
+        "_id": student_id,
         "userId": user_id,
         "tenantId": ObjectId(tenant_id),
         "enrolledCourses": [],
@@ -81,11 +69,9 @@ async def create_student(student: StudentCreate, tenant_id: str):
         "updatedAt": datetime.utcnow(),
     }
 
-    result = await COLLECTION.insert_one(student_doc)
-
     performance_doc = {
         "tenantId": ObjectId(tenant_id),
-        "studentId": result.inserted_id,
+        "studentId": student_id,
         "userId": user_id,
         "studentName": data["fullName"],
         "totalPoints": 0,
@@ -101,11 +87,13 @@ async def create_student(student: StudentCreate, tenant_id: str):
         "updatedAt": datetime.utcnow(),
     }
 
-    await student_performance_collection.insert_one(performance_doc)
+    return user_doc, student_doc, performance_doc
+
 
+def _combine_student_docs(user_doc: dict, student_doc: dict):
     new_student_combined = {
-        "_id": result.inserted_id,
-        "tenantId": ObjectId(tenant_id),
+        "_id": student_doc["_id"],
+        "tenantId": student_doc["tenantId"],
         "fullName": user_doc["fullName"],
         "email": user_doc["email"],
         "password": user_doc["password"],
@@ -124,6 +112,123 @@ async def create_student(student: StudentCreate, tenant_id: str):
     return fix_object_ids(new_student_combined)
 
 
+# ------------------ Helper: Insert Student Documents ------------------ #
+async def _rollback_student_docs(user_ids: list, student_ids: list):
+    """Remove whatever part of a failed student create made it to the database."""
+    await asyncio.gather(
+        users_collection.delete_many({"_id": {"$in": user_ids}}),
+        COLLECTION.delete_many({"_id": {"$in": student_ids}}),
+        student_performance_collection.delete_many({"studentId": {"$in": student_ids}}),
+    )
+
+
+async def _insert_student_docs(user_docs: list, student_docs: list, performance_docs: list):
+    """
+    Insert users first, then the student and performance profiles together.
+    If any insert fails, the docs already written are deleted again so no
+    orphan user / profile / performance record is left behind.
+    """
+    user_ids = [u["_id"] for u in user_docs]
+    student_ids = [st["_id"] for st in student_docs]
+
+    try:
+        await users_collection.insert_many(user_docs)
+    except Exception:
+        await users_collection.delete_many({"_id": {"$in": user_ids}})
+        raise
+
+    results = await asyncio.gather(
+        COLLECTION.insert_many(student_docs),
+        student_performance_collection.insert_many(performance_docs),
+        return_exceptions=True,
+    )
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        await _rollback_student_docs(user_ids, student_ids)
+        raise errors[0]
+
+
+# ---------------------------------------------------------------------------
+# Create Student (Multi-Tenant)
+# ---------------------------------------------------------------------------
+async def create_student(student: StudentCreate, tenant_id: str):
+    data = student.model_dump()
+
+    # Duplicate-email and tenant checks are independent; run them together
+    existing_user, tenant = await asyncio.gather(
+        users_collection.find_one({"email": data["email"]}, {"_id": 1}),
+        tenants_collection.find_one({"_id": ObjectId(tenant_id)}, {"_id": 1}),
+    )
+
+    # Check if user exists
+    if existing_user:
+        raise HTTPException(
+            status_code=400, detail="User with this email already exists"
+        )
+
+    # 0. Check if tenant exists
+    if not tenant:
+        raise HTTPException(
+            status_code=404, detail=f"Tenant not found with ID: {tenant_id}"
+        )
+
+    user_doc, student_doc, performance_doc = _build_student_docs(
+        data, tenant_id, hash_password(data["password"])
+    )
+
+    await _insert_student_docs([user_doc], [student_doc], [performance_doc])
+    invalidate_tenant_counts(tenant_id)
+
+    return _combine_student_docs(user_doc, student_doc)
+
+
+# ---------------------------------------------------------------------------
+# Bulk Create Students (Multi-Tenant)
+# ---------------------------------------------------------------------------
+async def create_students_bulk(students: list[StudentCreate], tenant_id: str):
+    rows = [s.model_dump() for s in students]
+    if not rows:
+        return []
+
+    emails = [r["email"].lower() for r in rows]
+    if len(set(emails)) != len(emails):
+        raise HTTPException(status_code=400, detail="Duplicate emails in request")
+
+    # One lookup for every email in the batch, alongside the tenant check
+    existing, tenant = await asyncio.gather(
+        users_collection.find({"email": {"$in": emails}}, {"email": 1}).to_list(
+            length=None
+        ),
+        tenants_collection.find_one({"_id": ObjectId(tenant_id)}, {"_id": 1}),
+    )
+
+    if existing:
+        taken = ", ".join(u["email"] for u in existing)
+        raise HTTPException(
+            status_code=400, detail=f"Users with these emails already exist: {taken}"
+        )
+
+    if not tenant:
+        raise HTTPException(
+            status_code=404, detail=f"Tenant not found with ID: {tenant_id}"
+        )
+
+    # Hashing is CPU-bound; spread it over worker threads
+    hashed = await asyncio.gather(
+        *(asyncio.to_thread(hash_password, r["password"]) for r in rows)
+    )
+    docs = [
+        _build_student_docs(r, tenant_id, h) for r, h in zip(rows, hashed)
+    ]
+    user_docs, student_docs, performance_docs = (list(d) for d in zip(*docs))
+
+    # One insert_many per collection instead of three inserts per student
+    await _insert_student_docs(user_docs, student_docs, performance_docs)
+    invalidate_tenant_counts(tenant_id)
+
+    return [_combine_student_docs(u, st) for u, st, _ in docs]
+
+
 # ---------------------------------------------------------------------------
 # Login (Email only — tenant irrelevant)
 # ---------------------------------------------------------------------------
@@ -230,7 +335,7 @@ async def update_student(student_id: str, tenantId: str, update: StudentUpdate):
         return None
 
     # Exclude unset fields (don't overwrite with nulls)
-    update_dict = update.dict(exclude_unset=True)
+    update_dict = update.model_dump(exclude_unset=True)
 
     # 2. Clean data: Filter out empty strings for optional fields to avoid overwriting with empty
     # except for profileImageURL which might be cleared intentionally
@@ -252,7 +357,8 @@ async def update_student(student_id: str, tenantId: str, update: StudentUpdate):
     update_data["updatedAt"] = datetime.utcnow()
 
     # ✅ Update USERS collection
-    await db.users.update_one({"_id": user_id}, {"$set": update_data})
+    await users_collection.update_one({"_id": user_id}, {"$set": update_data})
+    invalidate_user(user_id)
 
     # ✅ Update STUDENT collection timestamp
     await COLLECTION.update_one(
@@ -304,6 +410,7 @@ async def delete_student(student_id: str, tenant_id: str):
     # If student was not deleted → stop
     if result.deleted_count == 0:
         return False
+    invalidate_tenant_counts(tenant_id)
 
     # STEP 3.5 — Delete User (Cascading Delete for Students)
     if student.get("userId"):
@@ -311,6 +418,7 @@ async def delete_student(student_id: str, tenant_id: str):
         await users_collection.delete_one(
             {"_id": ObjectId(user_id) if not isinstance(user_id, ObjectId) else user_id}
         )
+        invalidate_user(user_id)
 
     # STEP 4 — Delete student performance document for this student + tenant
     await student_performance_collection.delete_one(
@@ -1,18 +1,14 @@
 # app/crud/subscription.py
 from typing import List, Optional
-from app.db.database import db
-from app.schemas.subscription import Subscription
+from app.db.database import subscriptions_collection
+from app.utils.cache import subscription_list_cache
+from app.schemas.subscription import Subscription, SubscriptionUpdate
 from bson import ObjectId
+from fastapi import HTTPException
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from datetime import datetime
 
-# Convert MongoDB _id to string
-def convert_id(doc):
-    if not doc:
-        return None
-    if "_id" in doc:
-        doc["id"] = str(doc["_id"])
-    return doc
-
 # Convert ISO strings to datetime if they come as strings
 def parse_datetime(sub_dict: dict):
     expiry = sub_dict.get("expiry_date")
@@ -26,43 +22,105 @@ def parse_datetime(sub_dict: dict):
 
     return sub_dict
 
+# Fields the Subscription schema reads, with _id stringified server-side as `id`
+SUBSCRIPTION_PROJECTION = {
+    "_id": 0,
+    "id": {"$toString": "$_id"},
+    "plan": 1,
+    "max_students": 1,
+    "max_teachers": 1,
+    "max_courses": 1,
+    "ai_credits": 1,
+    "storage_gb": 1,
+    "price_per_month": 1,
+    "billing_cycle": 1,
+    "status": 1,
+    "expiry_date": 1,
+    "payment_history": 1,
+    "userId": 1,
+    "tenantId": 1,
+}
+
 async def fetch_subscriptions():
-    subs = await db.subscriptions.find().to_list(100)
-    return [convert_id(sub) for sub in subs]
+    return await subscriptions_collection.aggregate(
+        [{"$limit": 100}, {"$project": SUBSCRIPTION_PROJECTION}]
+    ).to_list(length=100)
 
 async def fetch_subscription_by_tenant(tenant_id: str):
-    sub = await db.subscriptions.find_one({"tenantId": tenant_id})
-    return convert_id(sub)
+    return await subscriptions_collection.find_one(
+        {"tenantId": tenant_id}, SUBSCRIPTION_PROJECTION
+    )
 
 async def create_subscription(sub: Subscription):
-    sub_dict = sub.dict()
+    sub_dict = sub.model_dump()
     sub_dict.pop("id", None)
     sub_dict = parse_datetime(sub_dict)
-    
-    # Ensure nested datetimes in payment_history are handled
-    if sub_dict.get("payment_history"):
-        for ph in sub_dict["payment_history"]:
-            if isinstance(ph.get("date"), str):
-                ph["date"] = datetime.fromisoformat(ph["date"].replace("Z", "+00:00"))
 
-    result = await db.subscriptions.insert_one(sub_dict)
-    inserted_sub = await db.subscriptions.find_one({"_id": result.inserted_id})
-    return convert_id(inserted_sub)
+    # insert_one sets _id in place; the stored document is already in hand
+    try:
+        result = await subscriptions_collection.insert_one(sub_dict)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Subscription already exists for tenant: {sub_dict.get('tenantId')}",
+        )
+    finally:
+        subscription_list_cache.clear()
+    sub_dict["id"] = str(result.inserted_id)
+    return sub_dict
+
+async def create_subscriptions_bulk(subs: List[Subscription]):
+    docs = []
+    for sub in subs:
+        sub_dict = sub.model_dump()
+        sub_dict.pop("id", None)
+        docs.append(parse_datetime(sub_dict))
+
+    if not docs:
+        return []
+
+    # One round trip for the batch; insert_many sets each doc's _id in place.
+    # Unordered, so rows with a fresh tenantId still land when others clash.
+    try:
+        await subscriptions_collection.insert_many(docs, ordered=False)
+    except BulkWriteError as exc:
+        write_errors = exc.details.get("writeErrors", [])
+        if not write_errors or any(e.get("code") != 11000 for e in write_errors):
+            raise
+        failed = {e["index"] for e in write_errors}
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "Some subscriptions were not created",
+                "created": [
+                    str(d["_id"]) for i, d in enumerate(docs) if i not in failed
+                ],
+                "failedTenantIds": [docs[i].get("tenantId") for i in sorted(failed)],
+            },
+        )
+    finally:
+        subscription_list_cache.clear()
+    for doc in docs:
+        doc["id"] = str(doc["_id"])
+    return docs
 
-async def update_subscription(tenant_id: str, sub: Subscription):
-    sub_dict = sub.dict(exclude_unset=True)
+async def update_subscription(tenant_id: str, sub: SubscriptionUpdate):
+    sub_dict = sub.model_dump(exclude_unset=True, exclude_none=True)
+    if not sub_dict:
+        return await fetch_subscription_by_tenant(tenant_id)
     sub_dict = parse_datetime(sub_dict)
     
-    result = await db.subscriptions.update_one(
+    updated_sub = await subscriptions_collection.find_one_and_update(
         {"tenantId": tenant_id},
-        {"$set": sub_dict}
+        {"$set": sub_dict},
+        projection=SUBSCRIPTION_PROJECTION,
+        return_document=ReturnDocument.AFTER,
     )
-    if result.matched_count == 0:
-        return None
-    updated_sub = await db.subscriptions.find_one({"tenantId": tenant_id})
-    return convert_id(updated_sub)
+    subscription_list_cache.clear()
+    return updated_sub
 
 async def delete_subscription(tenant_id: str):
-    result = await db.subscriptions.delete_one({"tenantId": tenant_id})
+    result = await subscriptions_collection.delete_one({"tenantId": tenant_id})
+    subscription_list_cache.clear()
     return result.deleted_count > 0
 
@@ -1,7 +1,8 @@
 from bson import ObjectId
 from datetime import datetime
-from app.db.database import db
+from app.db.database import users_collection
 from app.crud.users import serialize_user
+from app.utils.cache import invalidate_user
 
 
 def serialize_superadmin(user_doc):
@@ -15,7 +16,7 @@ def serialize_superadmin(user_doc):
 
 
 async def get_superadmin_by_user(user_id: str):
-    user = await db.users.find_one({"_id": ObjectId(user_id), "role": "super-admin"})
+    user = await users_collection.find_one({"_id": ObjectId(user_id), "role": "super-admin"})
     if not user:
         return None
     return serialize_superadmin(user)
@@ -32,15 +33,16 @@ async def update_superadmin(user_id: str, updates: dict):
 
     if user_fields:
         user_fields["updatedAt"] = datetime.utcnow()
-        result = await db.users.update_one(
+        result = await users_collection.update_one(
             {"_id": ObjectId(user_id), "role": ROLE_NAME}, {"$set": user_fields}
         )
         # Optional: check matched_count
         if result.matched_count == 0:
             return None
+        invalidate_user(user_id)
 
     # Fetch the updated document
-    user = await db.users.find_one({"_id": ObjectId(user_id), "role": ROLE_NAME})
+    user = await users_collection.find_one({"_id": ObjectId(user_id), "role": ROLE_NAME})
     if not user:
         return None
 
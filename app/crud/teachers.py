@@ -1,50 +1,57 @@
+import asyncio
 from datetime import datetime
 from bson import ObjectId
+from bson.errors import InvalidId
 from fastapi import HTTPException
-from app.db.database import db, users_collection
+from app.crud import oid
+from app.db.database import (
+    users_collection,
+    assignments_collection,
+    courses_collection,
+    quizzes_collection,
+    students_collection,
+    teachers_collection,
+    tenants_collection,
+)
 from app.schemas.teachers import TeacherCreate, TeacherUpdate, TeacherResponse
 from app.schemas.assignments import AssignmentCreate
 from app.schemas.quizzes import QuizCreate
 from app.crud.quizzes import serialize_quiz
 from app.utils.security import hash_password
+from app.utils.cache import invalidate_tenant_counts, invalidate_user
 
 # ------------------ Helpers ------------------
 
 
 def to_oid(id_str: str, field: str) -> ObjectId:
     try:
-        return ObjectId(id_str)
+        return oid(id_str)
     except Exception:
         raise HTTPException(400, f"Invalid {field}")
 
 
+def _maybe_oid(value):
+    """Parse value as an ObjectId once, falling back to the raw value."""
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        return value
+
+
 def serialize_teacher(t: dict) -> dict:
     """Convert Mongo teacher document -> API response format"""
 
-    # Fix qualifications
-    qualifications = []
-    for q in t.get("qualifications", []):
-        if isinstance(q, str):
-            qualifications.append(q)
-        elif isinstance(q, dict):
-            qualifications.append(q.get("degree", ""))
-        else:
-            qualifications.append(str(q))
-
-    # Fix subjects
-    subjects = []
-    for s in t.get("subjects", []):
-        if isinstance(s, str):
-            subjects.append(s)
-        elif isinstance(s, dict):
-            subjects.append(s.get("name", ""))
-        else:
-            subjects.append(str(s))
-
-    # Fix assignedCourses
-    assigned_courses = []
-    for c in t.get("assignedCourses", []):
-        assigned_courses.append(str(c))
+    # New writes store list[str] (validated by TeacherCreate/TeacherUpdate); legacy
+    # documents may still hold dicts, so fall back per element without isinstance
+    qualifications = [
+        q if type(q) is str else (q.get("degree", "") if type(q) is dict else str(q))
+        for q in t.get("qualifications", [])
+    ]
+    subjects = [
+        s if type(s) is str else (s.get("name", "") if type(s) is dict else str(s))
+        for s in t.get("subjects", [])
+    ]
+    assigned_courses = [str(c) for c in t.get("assignedCourses", [])]
 
     return {
         "id": str(t["_id"]),
@@ -83,7 +90,7 @@ def merge_user_data_teacher(teacher_doc, user_doc):
 
 
 async def create_teacher(data: TeacherCreate):
-    d = data.dict()
+    d = data.model_dump()
 
     # 1. Create USER document
     user_doc = {
@@ -102,12 +109,13 @@ async def create_teacher(data: TeacherCreate):
     }
 
     # 0. Check if tenant exists
-    tenant = await db.tenants.find_one({"_id": ObjectId(d["tenantId"])})
+    tenant = await tenants_collection.find_one({"_id": ObjectId(d["tenantId"])})
     if not tenant:
         raise HTTPException(
             status_code=404, detail=f"Tenant not found with ID: {d['tenantId']}"
         )
 
+    # Insert the user first so a failure (e.g. duplicate email) leaves no orphan profile
     user_result = await users_collection.insert_one(user_doc)
     user_id = user_result.inserted_id
 
@@ -115,52 +123,89 @@ async def create_teacher(data: TeacherCreate):
     teacher_doc = {
         "userId": user_id,
         "tenantId": ObjectId(d["tenantId"]),
-        "assignedCourses": [
-            ObjectId(c) if ObjectId.is_valid(c) else c
-            for c in d.get("assignedCourses", [])
-        ],
+        "assignedCourses": [_maybe_oid(c) for c in d.get("assignedCourses", [])],
         "qualifications": d.get("qualifications", []),
         "subjects": d.get("subjects", []),
         "createdAt": datetime.utcnow(),
         "updatedAt": datetime.utcnow(),
     }
 
-    result = await db.teachers.insert_one(teacher_doc)
+    await teachers_collection.insert_one(teacher_doc)
+    invalidate_tenant_counts(d["tenantId"])
 
     # Return combined data
     return merge_user_data_teacher(teacher_doc, user_doc)
 
 
-async def get_all_teachers():
+# User fields merge_user_data_teacher reads; keeps password hashes off the wire
+TEACHER_USER_PROJECTION = {
+    "fullName": 1,
+    "email": 1,
+    "profileImageURL": 1,
+    "contactNo": 1,
+    "country": 1,
+    "status": 1,
+    "role": 1,
+    "createdAt": 1,
+    "lastLogin": 1,
+}
+
+
+# Teacher fields serialize_teacher reads (user fields are a fallback for
+# profiles whose user document is missing)
+TEACHER_PROJECTION = {
+    **TEACHER_USER_PROJECTION,
+    "userId": 1,
+    "assignedCourses": 1,
+    "qualifications": 1,
+    "subjects": 1,
+    "tenantId": 1,
+    "updatedAt": 1,
+}
+
+
+def get_all_teachers_cursor():
+    """Return the unconsumed teachers+users cursor so the router can stream rows."""
     pipeline = [
+        {"$project": TEACHER_PROJECTION},
         {
             "$lookup": {
                 "from": "users",
                 "localField": "userId",
                 "foreignField": "_id",
+                "pipeline": [{"$project": TEACHER_USER_PROJECTION}],
                 "as": "userDetails",
             }
         },
         {"$unwind": {"path": "$userDetails", "preserveNullAndEmptyArrays": True}},
     ]
-    cursor = db.teachers.aggregate(pipeline)
-    results = []
-    async for doc in cursor:
-        user_info = doc.pop("userDetails", {}) or {}
-        results.append(merge_user_data_teacher(doc, user_info))
-    return results
+    return teachers_collection.aggregate(pipeline)
+
+
+def serialize_teacher_row(doc: dict) -> dict:
+    """Serialize one row of get_all_teachers_cursor."""
+    user_info = doc.pop("userDetails", {}) or {}
+    return merge_user_data_teacher(doc, user_info)
+
+
+async def get_all_teachers():
+    return [serialize_teacher_row(doc) async for doc in get_all_teachers_cursor()]
 
 
 async def get_teacher(id: str):
-    teacher = await db.teachers.find_one({"_id": to_oid(id, "teacherId")})
+    teacher = await teachers_collection.find_one(
+        {"_id": to_oid(id, "teacherId")}, TEACHER_PROJECTION
+    )
     if not teacher:
         return None
-    user = await users_collection.find_one({"_id": teacher.get("userId")})
+    user = await users_collection.find_one(
+        {"_id": teacher.get("userId")}, TEACHER_USER_PROJECTION
+    )
     return merge_user_data_teacher(teacher, user)
 
 
 async def update_teacher(id: str, updates: dict):
-    teacher = await db.teachers.find_one({"_id": to_oid(id, "teacherId")})
+    teacher = await teachers_collection.find_one({"_id": to_oid(id, "teacherId")})
     if not teacher:
         return None
 
@@ -199,46 +244,50 @@ async def update_teacher(id: str, updates: dict):
 
     if user_updates and user_id:
         user_updates["updatedAt"] = datetime.utcnow()
-        await db.users.update_one({"_id": user_id}, {"$set": user_updates})
+        await users_collection.update_one({"_id": user_id}, {"$set": user_updates})
 
     if teacher_updates:
         if "tenantId" in teacher_updates:
             teacher_updates["tenantId"] = ObjectId(teacher_updates["tenantId"])
         if "assignedCourses" in teacher_updates:
             teacher_updates["assignedCourses"] = [
-                ObjectId(c) if ObjectId.is_valid(c) else c
-                for c in teacher_updates["assignedCourses"]
+                _maybe_oid(c) for c in teacher_updates["assignedCourses"]
             ]
 
         teacher_updates["updatedAt"] = datetime.utcnow()
-        await db.teachers.update_one(
+        await teachers_collection.update_one(
             {"_id": to_oid(id, "teacherId")}, {"$set": teacher_updates}
         )
 
+    # status / tenantId feed the cached auth context
+    invalidate_user(user_id)
+
     return await get_teacher(id)
 
 
 async def delete_teacher(id: str):
-    teacher = await db.teachers.find_one({"_id": to_oid(id, "teacherId")})
+    teacher = await teachers_collection.find_one({"_id": to_oid(id, "teacherId")})
     if not teacher:
         return False
 
     user_id = teacher.get("userId")
 
     # 1. Delete from teachers
-    result = await db.teachers.delete_one({"_id": to_oid(id, "teacherId")})
+    result = await teachers_collection.delete_one({"_id": to_oid(id, "teacherId")})
+    invalidate_tenant_counts(teacher.get("tenantId"))
 
     # 2. Delete from users
     if user_id:
         await users_collection.delete_one(
             {"_id": ObjectId(user_id) if not isinstance(user_id, ObjectId) else user_id}
         )
+        invalidate_user(user_id)
 
     return result.deleted_count > 0
 
 
 async def change_password(id: str, old_password: str, new_password: str):
-    teacher = await db.teachers.find_one({"_id": to_oid(id, "teacherId")})
+    teacher = await teachers_collection.find_one({"_id": to_oid(id, "teacherId")})
     if not teacher:
         return None
 
@@ -268,7 +317,7 @@ async def change_password(id: str, old_password: str, new_password: str):
 # ------------------ Assignments ------------------
 
 
-async def serialize_assignment(a: dict) -> dict:
+def serialize_assignment(a: dict) -> dict:
     return {
         "id": str(a["_id"]),
         "courseId": str(a["courseId"]),
@@ -290,21 +339,21 @@ async def serialize_assignment(a: dict) -> dict:
 
 async def get_teacher_assignments_route(teacher_id: str):
     oid = to_oid(teacher_id, "teacherId")
-    cursor = db.assignments.find({"teacherId": oid})
+    cursor = assignments_collection.find({"teacherId": oid})
     return [serialize_assignment(a) async for a in cursor]
 
 
 async def create_teacher_assignment_route(data: AssignmentCreate):
-    d = data.dict()
+    d = data.model_dump()
     d["courseId"] = to_oid(d["courseId"], "courseId")
     d["teacherId"] = to_oid(d["teacherId"], "teacherId")
     d["tenantId"] = to_oid(d["tenantId"], "tenantId")
     d["uploadedAt"] = datetime.utcnow()
     d["updatedAt"] = datetime.utcnow()
 
-    result = await db.assignments.insert_one(d)
-    new_assignment = await db.assignments.find_one({"_id": result.inserted_id})
-    return serialize_assignment(new_assignment)
+    result = await assignments_collection.insert_one(d)
+    d["_id"] = result.inserted_id
+    return serialize_assignment(d)
 
 
 # ------------------ Quizzes ------------------
@@ -312,90 +361,222 @@ async def create_teacher_assignment_route(data: AssignmentCreate):
 
 async def get_teacher_quizzes_route(teacher_id: str):
     oid = to_oid(teacher_id, "teacherId")
-    cursor = db.quizzes.find({"teacherId": oid})
+    cursor = quizzes_collection.find({"teacherId": oid})
     return [serialize_quiz(q) async for q in cursor]
 
 
 async def create_teacher_quiz_route(data: QuizCreate):
-    d = data.dict()
+    d = data.model_dump()
     d["courseId"] = to_oid(d["courseId"], "courseId")
     d["teacherId"] = to_oid(d["teacherId"], "teacherId")
     d["tenantId"] = to_oid(d["tenantId"], "tenantId")
     d["createdAt"] = datetime.utcnow()
     d["updatedAt"] = datetime.utcnow()
 
-    result = await db.quizzes.insert_one(d)
-    new_quiz = await db.quizzes.find_one({"_id": result.inserted_id})
-    return serialize_quiz(new_quiz)
+    result = await quizzes_collection.insert_one(d)
+    d["_id"] = result.inserted_id
+    return serialize_quiz(d)
 
 
 # ------------------ Dashboard / Students / Courses ------------------
 
 
+def _teacher_items(teacher_oid: ObjectId, kind: str) -> list:
+    """Stages reducing one collection to a `kind` tag per document owned by the teacher."""
+    return [
+        {"$match": {"teacherId": teacher_oid}},
+        {"$project": {"_id": 0, "kind": {"$literal": kind}}},
+    ]
+
+
 async def get_teacher_dashboard(teacher_id: str):
-    assignments = await get_teacher_assignments_route(teacher_id)
-    quizzes = await get_teacher_quizzes_route(teacher_id)
-    courses = [
-        c async for c in db.courses.find({"teacherId": to_oid(teacher_id, "teacherId")})
+    teacher_oid = to_oid(teacher_id, "teacherId")
+
+    # One round trip: tag courses, assignments and quizzes, then count per tag
+    pipeline = [
+        *_teacher_items(teacher_oid, "courses"),
+        {"$unionWith": {"coll": "assignments", "pipeline": _teacher_items(teacher_oid, "assignments")}},
+        {"$unionWith": {"coll": "quizzes", "pipeline": _teacher_items(teacher_oid, "quizzes")}},
+        {"$group": {"_id": "$kind", "n": {"$sum": 1}}},
     ]
+    counts = {
+        row["_id"]: row["n"]
+        async for row in courses_collection.aggregate(pipeline)
+    }
 
     return {
-        "totalAssignments": len(assignments),
-        "totalQuizzes": len(quizzes),
-        "totalCourses": len(courses),
+        "totalAssignments": counts.get("assignments", 0),
+        "totalQuizzes": counts.get("quizzes", 0),
+        "totalCourses": counts.get("courses", 0),
     }
 
 
 async def get_teacher_students(teacher_id: str):
-    cursor = db.students.find({"teacherId": to_oid(teacher_id, "teacherId")})
-    return [s async for s in cursor]
+    # Students store enrolledCourses as course id strings
+    course_ids = [
+        str(c["_id"])
+        async for c in courses_collection.find(
+            {"teacherId": to_oid(teacher_id, "teacherId")}, {"_id": 1}
+        )
+    ]
+    if not course_ids:
+        return []
+
+    # Start from students so each one is its own result document, streamed
+    # off the cursor; students without a user doc are kept with blank fields
+    pipeline = [
+        {"$match": {"enrolledCourses": {"$in": course_ids}}},
+        {"$project": {"userId": 1, "enrolledCourses": 1}},
+        {
+            "$lookup": {
+                "from": "users",
+                "localField": "userId",
+                "foreignField": "_id",
+                "pipeline": [{"$project": {"fullName": 1, "email": 1, "status": 1}}],
+                "as": "user",
+            }
+        },
+        {"$unwind": {"path": "$user", "preserveNullAndEmptyArrays": True}},
+    ]
+
+    teacher_courses = set(course_ids)
+    students = []
+    async for s in students_collection.aggregate(pipeline):
+        user = s.get("user") or {}
+        students.append(
+            {
+                "id": str(s["_id"]),
+                "fullName": user.get("fullName", ""),
+                "email": user.get("email", ""),
+                "status": user.get("status", "active"),
+                "enrolledCourses": [
+                    c for c in s.get("enrolledCourses", []) if c in teacher_courses
+                ],
+            }
+        )
+    return students
 
 
 # async def get_teacher_courses(teacher_id: str):
-#     cursor = db.courses.find({"teacherId": to_oid(teacher_id, "teacherId")})
+#     cursor = courses_collection.find({"teacherId": to_oid(teacher_id, "teacherId")})
 #     return [c async for c in cursor]
 
 
+# Only the fields returned by get_teacher_courses
+TEACHER_COURSE_PROJECTION = {
+    "title": 1,
+    "description": 1,
+    "category": 1,
+    "status": 1,
+    "courseCode": 1,
+    "duration": 1,
+    "thumbnailUrl": 1,
+    "modules": 1,
+    "teacherId": 1,
+    "tenantId": 1,
+    "enrolledStudents": 1,
+    "createdAt": 1,
+    "updatedAt": 1,
+}
+
+
 async def get_teacher_courses(teacher_id: str):
     # Convert teacher_id to ObjectId
     teacher_oid = to_oid(teacher_id, "teacherId")
 
-    # Query courses where teacherId matches
-    cursor = db.courses.find({"teacherId": teacher_oid})
+    # Query courses where teacherId matches, in large batches to cut getMore round trips
+    rows = (
+        await courses_collection.find({"teacherId": teacher_oid}, TEACHER_COURSE_PROJECTION)
+        .batch_size(200)
+        .to_list(None)
+    )
 
-    courses = []
-    async for c in cursor:
-        courses.append(
-            {
-                "id": str(c["_id"]),
-                "title": c.get("title", ""),
-                "description": c.get("description", ""),
-                "category": c.get("category", ""),
-                "status": c.get("status", ""),
-                "courseCode": c.get("courseCode", ""),
-                "duration": c.get("duration", ""),
-                "thumbnailUrl": c.get("thumbnailUrl", ""),
-                "modules": c.get("modules", []),
-                "teacherId": str(c.get("teacherId", "")),
-                "tenantId": str(c.get("tenantId", "")),
-                "enrolledStudents": c.get("enrolledStudents", 0),
-                "createdAt": c.get("createdAt"),
-                "updatedAt": c.get("updatedAt"),
-            }
-        )
+    return [serialize_teacher_course(c) for c in rows]
+
+
+def serialize_teacher_course(c: dict) -> dict:
+    return {
+        "id": str(c["_id"]),
+        "title": c.get("title", ""),
+        "description": c.get("description", ""),
+        "category": c.get("category", ""),
+        "status": c.get("status", ""),
+        "courseCode": c.get("courseCode", ""),
+        "duration": c.get("duration", ""),
+        "thumbnailUrl": c.get("thumbnailUrl", ""),
+        "modules": c.get("modules", []),
+        "teacherId": str(c.get("teacherId", "")),
+        "tenantId": str(c.get("tenantId", "")),
+        "enrolledStudents": c.get("enrolledStudents", 0),
+        "createdAt": c.get("createdAt"),
+        "updatedAt": c.get("updatedAt"),
+    }
 
-    return courses
+
+# Fields serialize_assignment reads
+TEACHER_ASSIGNMENT_PROJECTION = {
+    "courseId": 1,
+    "teacherId": 1,
+    "title": 1,
+    "description": 1,
+    "dueDate": 1,
+    "dueTime": 1,
+    "totalMarks": 1,
+    "passingMarks": 1,
+    "status": 1,
+    "fileUrl": 1,
+    "allowedFormats": 1,
+    "tenantId": 1,
+    "uploadedAt": 1,
+    "updatedAt": 1,
+}
+
+# Newest items per section returned by get_teacher_overview
+OVERVIEW_LIMIT = 50
+
+
+async def get_teacher_overview(teacher_id: str, tenant_id: str = None):
+    """
+    A teacher's most recent courses, assignments and quizzes.
+    Returns None when the teacher doesn't exist or belongs to another tenant.
+    """
+    teacher_oid = to_oid(teacher_id, "teacherId")
+    teacher = await teachers_collection.find_one({"_id": teacher_oid}, {"tenantId": 1})
+    if not teacher:
+        return None
+    if tenant_id and str(teacher.get("tenantId")) != str(tenant_id):
+        return None
+
+    # Three bounded queries side by side; each row is its own result document
+    owned = {"teacherId": teacher_oid}
+    courses, assignments, quizzes = await asyncio.gather(
+        courses_collection.find(owned, TEACHER_COURSE_PROJECTION)
+        .sort("createdAt", -1)
+        .to_list(length=OVERVIEW_LIMIT),
+        assignments_collection.find(owned, TEACHER_ASSIGNMENT_PROJECTION)
+        .sort("uploadedAt", -1)
+        .to_list(length=OVERVIEW_LIMIT),
+        quizzes_collection.find({**owned, "isDeleted": False})
+        .sort("createdAt", -1)
+        .to_list(length=OVERVIEW_LIMIT),
+    )
+
+    return {
+        "courses": [serialize_teacher_course(c) for c in courses],
+        "assignments": [serialize_assignment(a) for a in assignments],
+        "quizzes": [serialize_quiz(q) for q in quizzes],
+    }
 
 
 async def get_teacher_by_user(user_id: str):
     if isinstance(user_id, str):
         user_id = ObjectId(user_id)
 
-    teacher = await db.teachers.find_one({"userId": user_id})
+    teacher = await teachers_collection.find_one({"userId": user_id}, TEACHER_PROJECTION)
     if not teacher:
         return None
 
-    user = await users_collection.find_one({"_id": user_id})
+    user = await users_collection.find_one({"_id": user_id}, TEACHER_USER_PROJECTION)
     return merge_user_data_teacher(teacher, user)
 
 
@@ -403,7 +584,7 @@ async def update_teacher_profile(user_id: str, updates: dict):
     if isinstance(user_id, str):
         user_id = ObjectId(user_id)
 
-    teacher = await db.teachers.find_one({"userId": user_id})
+    teacher = await teachers_collection.find_one({"userId": user_id}, TEACHER_PROJECTION)
     if not teacher:
         return None
 
@@ -415,6 +596,12 @@ async def update_teacher_profile(user_id: str, updates: dict):
         # if isinstance(v, str) and v.strip() == "" and k != "profileImageURL": continue
         cleaned_updates[k] = v
 
+    # Nothing changed (e.g. the client echoed back an empty patch): skip the writes
+    if not cleaned_updates:
+        return merge_user_data_teacher(
+            teacher, await users_collection.find_one({"_id": user_id}, TEACHER_USER_PROJECTION)
+        )
+
     cleaned_updates["updatedAt"] = datetime.utcnow()
 
     user_fields = [
@@ -435,12 +622,15 @@ async def update_teacher_profile(user_id: str, updates: dict):
     if user_updates:
         user_updates["updatedAt"] = datetime.utcnow()
         await users_collection.update_one({"_id": user_id}, {"$set": user_updates})
+        invalidate_user(user_id)
 
     if teacher_updates:
         teacher_updates["updatedAt"] = datetime.utcnow()
-        await db.teachers.update_one({"userId": user_id}, {"$set": teacher_updates})
+        await teachers_collection.update_one({"userId": user_id}, {"$set": teacher_updates})
 
     # Fetch fresh
-    teacher = await db.teachers.find_one({"userId": user_id})
-    user = await users_collection.find_one({"_id": user_id})
+    teacher, user = await asyncio.gather(
+        teachers_collection.find_one({"userId": user_id}, TEACHER_PROJECTION),
+        users_collection.find_one({"_id": user_id}, TEACHER_USER_PROJECTION),
+    )
     return merge_user_data_teacher(teacher, user)
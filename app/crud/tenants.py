@@ -1,7 +1,12 @@
+import re
+
 from fastapi import HTTPException, status
-from app.db.database import db
+from app.crud import oid
+from app.db.database import tenants_collection
+from app.utils.cache import invalidate_tenant, tenant_cache, tenant_list_cache
 from datetime import datetime
 from bson import ObjectId
+from pymongo import ReturnDocument
 from typing import Optional, Any
 
 
@@ -11,7 +16,7 @@ def _ensure_objectid(_id: str, name: str = "id"):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid ObjectId for {name}",
         )
-    return ObjectId(_id)
+    return oid(_id)
 
 
 # -------------------------
@@ -32,15 +37,55 @@ def serialize_tenant(tenant: dict) -> dict:
     }
 
 
+# Fields serialize_tenant reads
+TENANT_PROJECTION = {
+    "tenantName": 1,
+    "tenantLogoUrl": 1,
+    "adminEmail": 1,
+    "status": 1,
+    "subscriptionId": 1,
+    "createdAt": 1,
+    "updatedAt": 1,
+}
+
+
+# Lowercased copies of the searchable fields. Prefix search runs a
+# case-sensitive "^" regex on these, which MongoDB can answer with index
+# bounds; an "i" regex on the originals has to walk every index key.
+SEARCH_KEYS = {"tenantName": "tenantNameLower", "adminEmail": "adminEmailLower"}
+
+
+def _set_search_keys(data: dict) -> dict:
+    for field, lower in SEARCH_KEYS.items():
+        if isinstance(data.get(field), str):
+            data[lower] = data[field].lower()
+    return data
+
+
+async def backfill_tenant_search_keys():
+    """Fill the lowercased search fields on tenants created before they existed."""
+    await tenants_collection.update_many(
+        {"tenantNameLower": {"$exists": False}},
+        [
+            {
+                "$set": {
+                    lower: {"$toLower": f"${field}"}
+                    for field, lower in SEARCH_KEYS.items()
+                }
+            }
+        ],
+    )
+
+
 # -------------------------
 # Create a new tenant
 # -------------------------
 async def create_tenant(request):
     # Convert Pydantic model to dictionary
-    data = request.dict()
+    data = request.model_dump()
 
     # duplicate check: any tenant with same name that isn't soft-deleted
-    existing = await db.tenants.find_one(
+    existing = await tenants_collection.find_one(
         {"tenantName": data["tenantName"], "isDeleted": {"$ne": True}}
     )
 
@@ -72,11 +117,14 @@ async def create_tenant(request):
         }
     )
 
+    _set_search_keys(data)
+
     # Insert into MongoDB
-    result = await db.tenants.insert_one(data)
+    result = await tenants_collection.insert_one(data)
+    tenant_list_cache.clear()
 
     # Fetch the created tenant
-    new_tenant = await db.tenants.find_one({"_id": result.inserted_id})
+    new_tenant = await tenants_collection.find_one({"_id": result.inserted_id})
 
     return serialize_tenant(new_tenant)
 
@@ -98,14 +146,15 @@ async def get_all_tenants(
     if status:
         query["status"] = status
 
-    # Case-insensitive search on tenantName & adminEmail
-    if search:
-        query["$or"] = [
-            {"tenantName": {"$regex": search, "$options": "i"}},
-            {"adminEmail": {"$regex": search, "$options": "i"}},
-        ]
+    # Search: case-insensitive prefix match on tenant name or admin email.
+    # Anchored, escaped and case-sensitive against the lowercased copies, so
+    # each branch is an index range scan.
+    term = search.strip().lower() if search else ""
+    if term:
+        prefix = {"$regex": f"^{re.escape(term)}"}
+        query["$or"] = [{lower: prefix} for lower in SEARCH_KEYS.values()]
 
-    cursor = db.tenants.find(query)
+    cursor = tenants_collection.find(query, TENANT_PROJECTION)
 
     # Sorting logic
     if sort:
@@ -123,9 +172,22 @@ async def get_all_tenants(
 # Get a single tenant by id
 # -------------------------
 async def get_tenant(_id: str):
-    _ensure_objectid(_id, "tenantId")
-    tenant = await db.tenants.find_one({"_id": ObjectId(_id), "isDeleted": False})
-    return serialize_tenant(tenant) if tenant else None
+    tenant_oid = _ensure_objectid(_id, "tenantId")
+
+    # Cache-aside: tenants change rarely; update/delete drop the entry
+    cached = tenant_cache.get(_id)
+    if cached is not None:
+        return cached
+
+    tenant = await tenants_collection.find_one(
+        {"_id": tenant_oid, "isDeleted": False}, TENANT_PROJECTION
+    )
+    if not tenant:
+        return None
+
+    tenant = serialize_tenant(tenant)
+    tenant_cache.set(_id, tenant)
+    return tenant
 
 
 # -------------------------
@@ -157,13 +219,16 @@ async def update_tenant(_id: str, updates: dict):
         _ensure_objectid(safe_updates["subscriptionId"], "subscriptionId")
         safe_updates["subscriptionId"] = ObjectId(safe_updates["subscriptionId"])
 
+    _set_search_keys(safe_updates)
     safe_updates["updatedAt"] = datetime.utcnow()
 
-    await db.tenants.update_one(
-        {"_id": ObjectId(_id), "isDeleted": False}, {"$set": safe_updates}
+    tenant = await tenants_collection.find_one_and_update(
+        {"_id": oid(_id), "isDeleted": False},
+        {"$set": safe_updates},
+        projection=TENANT_PROJECTION,
+        return_document=ReturnDocument.AFTER,
     )
-
-    tenant = await db.tenants.find_one({"_id": ObjectId(_id), "isDeleted": False})
+    invalidate_tenant(_id)
     return serialize_tenant(tenant) if tenant else None
 
 
@@ -172,8 +237,9 @@ async def update_tenant(_id: str, updates: dict):
 # -------------------------
 async def delete_tenant(_id):
     # soft delete
-    result = await db.tenants.update_one(
-        {"_id": ObjectId(_id)},
+    result = await tenants_collection.update_one(
+        {"_id": oid(_id)},
         {"$set": {"isDeleted": True, "updatedAt": datetime.utcnow()}},
     )
+    invalidate_tenant(_id)
     return result.modified_count > 0
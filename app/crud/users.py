@@ -1,6 +1,6 @@
 from bson import ObjectId
 from datetime import datetime
-from app.db.database import db
+from app.db.database import users_collection
 from app.utils.security import hash_password, verify_password
 
 
@@ -25,12 +25,13 @@ def serialize_user(u: dict):
 
 
 async def get_user_by_email(email: str):
-    return await db.users.find_one({"email": email.lower()})
+    return await users_collection.find_one({"email": email.lower()})
 
 
-async def create_user(data: dict):
+async def create_user(data: dict, password_hashed: bool = False):
     data["email"] = data["email"].lower()
-    data["password"] = hash_password(data["password"])
+    if not password_hashed:
+        data["password"] = hash_password(data["password"])
     data["createdAt"] = datetime.utcnow()
     data["updatedAt"] = datetime.utcnow()
     data["lastLogin"] = None
@@ -38,28 +39,57 @@ async def create_user(data: dict):
     if data.get("tenantId"):
         data["tenantId"] = ObjectId(data["tenantId"])
 
-    result = await db.users.insert_one(data)
-    new_user = await db.users.find_one({"_id": result.inserted_id})
+    result = await users_collection.insert_one(data)
+    new_user = await users_collection.find_one({"_id": result.inserted_id})
     return serialize_user(new_user)
 
 
+# Role-specific profile collections, keyed by the lookup alias used below
+ROLE_LOOKUPS = {"teacher": "_t", "student": "_s", "admin": "_a"}
+
+
 async def verify_user(email: str, password: str):
-    u = await get_user_by_email(email)
+    # Fetch the user together with its role-specific profile in a single round trip
+    pipeline = [
+        {"$match": {"email": email.lower()}},
+        {"$limit": 1},
+        {
+            "$lookup": {
+                "from": "teachers",
+                "localField": "_id",
+                "foreignField": "userId",
+                "as": "_t",
+            }
+        },
+        {
+            "$lookup": {
+                "from": "students",
+                "localField": "_id",
+                "foreignField": "userId",
+                "as": "_s",
+            }
+        },
+        {
+            "$lookup": {
+                "from": "admins",
+                "localField": "_id",
+                "foreignField": "userId",
+                "as": "_a",
+            }
+        },
+    ]
+    results = await users_collection.aggregate(pipeline).to_list(length=1)
+    u = results[0] if results else None
     if not u or not verify_password(password, u["password"]):
         return None
 
-    # After verifying, fetch the role-specific doc to get the tenant_id and role-specific ID
-    user_id = u["_id"]
     role = u["role"]
     tenant_id = u.get("tenantId")  # Start with tenantId from users collection
-    role_doc = None
 
-    if role == "teacher":
-        role_doc = await db.teachers.find_one({"userId": user_id})
-    elif role == "student":
-        role_doc = await db.students.find_one({"userId": user_id})
-    elif role == "admin":
-        role_doc = await db.admins.find_one({"userId": user_id})
+    # Pick the profile matching the user's role and drop the lookup arrays
+    lookups = {alias: u.pop(alias, []) for alias in ROLE_LOOKUPS.values()}
+    role_docs = lookups.get(ROLE_LOOKUPS.get(role), [])
+    role_doc = role_docs[0] if role_docs else None
 
     # If the role-specific document has a tenantId, it takes precedence
     if role_doc and role_doc.get("tenantId"):
@@ -78,6 +108,6 @@ async def verify_user(email: str, password: str):
 
 
 async def update_last_login(user_id: str):
-    await db.users.update_one(
+    await users_collection.update_one(
         {"_id": ObjectId(user_id)}, {"$set": {"lastLogin": datetime.utcnow()}}
     )
@@ -6,7 +6,17 @@ load_dotenv()
 
 MONGO_URI = os.getenv("MONGO_URI")
 
-client = AsyncIOMotorClient(MONGO_URI)
+# One client per process; every CRUD module shares its connection pool.
+# Each uvicorn worker opens its own pool, so the server sees up to
+# workers * MONGO_MAX_POOL_SIZE connections - size it against that.
+client = AsyncIOMotorClient(
+    MONGO_URI,
+    maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "50")),
+    minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", "10")),
+    maxIdleTimeMS=int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "30000")),
+    serverSelectionTimeoutMS=int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "3000")),
+    retryWrites=True,
+)
 db = client["LMS"]
 
 
@@ -26,3 +36,7 @@ assignment_submissions_collection = db["assignmentSubmissions"]
 quizzes_collection = db["quizzes"]
 quiz_submissions_collection = db["quizSubmissions"]
 users_collection = db["users"]
+teachers_collection = db["teachers"]
+admins_collection = db["admins"]
+tenants_collection = db["tenants"]
+subscriptions_collection = db["subscriptions"]
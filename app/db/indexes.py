@@ -0,0 +1,86 @@
+import logging
+
+from pymongo import ASCENDING, DESCENDING, TEXT
+from pymongo.errors import OperationFailure
+
+from app.db.database import db
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------
+# STARTUP INDEXES
+# ---------------------------
+async def ensure_indexes():
+    """Create the tenant-scoped compound indexes used by the list routes.
+
+    create_index is a no-op when an identical index already exists, so this
+    is safe to run on every startup.
+    """
+    # Assignment submissions: by student / by assignment, newest first
+    await db.assignmentSubmissions.create_index(
+        [("tenantId", ASCENDING), ("studentId", ASCENDING), ("submittedAt", DESCENDING)]
+    )
+    await db.assignmentSubmissions.create_index(
+        [("tenantId", ASCENDING), ("assignmentId", ASCENDING), ("submittedAt", DESCENDING)]
+    )
+
+    # Assignments: teacher listings sorted by upload date, course filters
+    await db.assignments.create_index(
+        [("tenantId", ASCENDING), ("teacherId", ASCENDING), ("uploadedAt", DESCENDING)]
+    )
+    await db.assignments.create_index(
+        [("tenantId", ASCENDING), ("courseId", ASCENDING)]
+    )
+
+    # Quizzes: keyset pagination over (createdAt, _id)
+    await db.quizzes.create_index([("createdAt", DESCENDING), ("_id", DESCENDING)])
+
+    # Courses: relevance search and the tenant/status/category list filters
+    await db.courses.create_index(
+        [
+            ("title", TEXT),
+            ("description", TEXT),
+            ("category", TEXT),
+            ("courseCode", TEXT),
+        ],
+        name="course_search_text",
+    )
+    await db.courses.create_index(
+        [("tenantId", ASCENDING), ("status", ASCENDING), ("category", ASCENDING)]
+    )
+
+    # Teacher dashboard / students: per-teacher lookups and course enrollments
+    await db.courses.create_index([("teacherId", ASCENDING)])
+    await db.assignments.create_index([("teacherId", ASCENDING)])
+    await db.quizzes.create_index([("teacherId", ASCENDING)])
+    await db.students.create_index([("enrolledCourses", ASCENDING)])
+
+    # Profiles: tenant-scoped dashboard lists and counts
+    await db.teachers.create_index([("tenantId", ASCENDING)])
+    await db.students.create_index([("tenantId", ASCENDING)])
+
+    # Tenants: status filter with createdAt sort, the duplicate-name check on
+    # create, and name/email prefix search on the lowercased copies
+    await db.tenants.create_index(
+        [("isDeleted", ASCENDING), ("status", ASCENDING), ("createdAt", DESCENDING)]
+    )
+    await db.tenants.create_index([("tenantName", ASCENDING)])
+    await db.tenants.create_index([("tenantNameLower", ASCENDING)])
+    await db.tenants.create_index([("adminEmailLower", ASCENDING)])
+
+    # Subscriptions: one per tenant, looked up / updated / deleted by tenantId.
+    # Existing duplicates make the unique build fail; don't block startup on
+    # that, fall back to a plain index until the data is cleaned up.
+    try:
+        await db.subscriptions.create_index([("tenantId", ASCENDING)], unique=True)
+    except OperationFailure as exc:
+        if exc.code != 11000:
+            raise
+        logger.warning(
+            "subscriptions.tenantId has duplicate values; unique index not built: %s",
+            exc,
+        )
+        await db.subscriptions.create_index(
+            [("tenantId", ASCENDING)], name="tenantId_nonunique"
+        )
@@ -1,5 +1,11 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from app.core import settings
+from app.db.indexes import ensure_indexes
+from app.crud.tenants import backfill_tenant_search_keys
 from app.routers.roles import admins, students, super_admin, teachers
 
 from app.routers import (
@@ -15,27 +21,30 @@ from app.routers import (
 from app.routers.auth import admin_auth, student_auth, teacher_auth, login
 from app.routers.dashboards import admin_dashboard
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await ensure_indexes()
+    await backfill_tenant_search_keys()
+    yield
+
+
 app = FastAPI(
     title="EduVerse AI Backend",
     description="Multi-Tenant E-Learning Platform API",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
-origins = [
-    "http://localhost:4200",
-    "http://localhost:8000",
-    "http://localhost:8000/assignments/",
-    "http://127.0.0.1:4200",
-    "http://127.0.0.1:8000",
-]
-
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=origins,
+    allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -1,17 +1,23 @@
+import orjson
 from fastapi import APIRouter, Depends, HTTPException
-from typing import List
-from bson import ObjectId
-from app.auth.dependencies import require_role, require_tenant
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import TypeAdapter
+from typing import Dict, List
+from app.auth.dependencies import require_role_and_tenant
+from app.crud import validate_object_id
 from app.schemas.assignment_submissions import (
     AssignmentSubmissionCreate,
     AssignmentSubmissionUpdate,
     AssignmentSubmissionResponse,
+    SubmissionsByAssignmentsRequest,
 )
 from app.crud.assignment_submissions import (
     create_submission,
-    get_all_submissions,
+    get_all_submissions_cursor,
     get_submissions_by_student,
-    get_submissions_by_assignment,
+    get_submissions_by_assignment_cursor,
+    get_submissions_by_assignments,
+    serialize_submission,
     grade_submission,
     delete_submission,
 )
@@ -19,19 +25,37 @@ from app.crud.assignment_submissions import (
 router = APIRouter(
     prefix="/assignment-submissions",
     tags=["Assignment Submissions"],
+    default_response_class=ORJSONResponse,
 )
 
 
-def validate_object_id(id: str, name: str = "id"):
-    if not ObjectId.is_valid(id):
-        raise HTTPException(
-            status_code=400, detail=f"Invalid ObjectId format for {name}"
-        )
+# Shared dependency instances: one object per role set across all routes
+REQUIRE_STUDENT = Depends(require_role_and_tenant("student"))
+REQUIRE_TEACHER_ADMIN = Depends(require_role_and_tenant("teacher", "admin"))
+REQUIRE_ADMIN = Depends(require_role_and_tenant("admin"))
+
+
+# Built once at import; validates and encodes a whole list in one pydantic-core call
+_SUBMISSIONS_ADAPTER = TypeAdapter(List[AssignmentSubmissionResponse])
+
+# Body fields that must be ObjectIds when creating a submission
+_SUBMISSION_OID_FIELDS = ("assignmentId", "courseId")
+
 
+def stream_submissions(cursor) -> StreamingResponse:
+    """Stream a submissions cursor as a JSON array, one row at a time."""
 
-def clean_updates(data: dict):
-    """Remove empty strings or null-like values from updates."""
-    return {k: v for k, v in data.items() if v not in [None, "", [], {}]}
+    async def gen():
+        yield b"["
+        first = True
+        async for doc in cursor:
+            if not first:
+                yield b","
+            first = False
+            yield orjson.dumps(serialize_submission(doc))
+        yield b"]"
+
+    return StreamingResponse(gen(), media_type="application/json")
 
 
 # ===============================
@@ -40,16 +64,15 @@ def clean_updates(data: dict):
 @router.post("/", response_model=AssignmentSubmissionResponse)
 async def create_submission_route(
     data: AssignmentSubmissionCreate,
-    current_user=Depends(require_role("student")),
-    _=Depends(require_tenant),  # enforce tenant
+    current_user=REQUIRE_STUDENT,
 ):
     if not data.assignmentId or not data.courseId or not data.fileUrl:
         raise HTTPException(
             status_code=400, detail="assignmentId, courseId, and fileUrl are required"
         )
 
-    validate_object_id(data.assignmentId, "assignmentId")
-    validate_object_id(data.courseId, "courseId")
+    for name in _SUBMISSION_OID_FIELDS:
+        validate_object_id(getattr(data, name), name)
 
     submission = await create_submission(
         data=data,
@@ -66,15 +89,15 @@ async def create_submission_route(
 # ===============================
 # ADMIN / TEACHER: ALL SUBMISSIONS
 # ===============================
-@router.get("/", response_model=List[AssignmentSubmissionResponse])
+@router.get(
+    "/",
+    response_class=StreamingResponse,
+    responses={200: {"model": List[AssignmentSubmissionResponse]}},
+)
 async def get_all_submissions_route(
-    current_user=Depends(require_role("admin", "teacher")),
-    _=Depends(require_tenant),
+    current_user=REQUIRE_TEACHER_ADMIN,
 ):
-    submissions = await get_all_submissions(current_user["tenant_id"])
-    if submissions is None:
-        return []
-    return submissions
+    return stream_submissions(get_all_submissions_cursor(current_user["tenant_id"]))
 
 
 # ===============================
@@ -82,16 +105,16 @@ async def get_all_submissions_route(
 # ===============================
 @router.get("/me", response_model=List[AssignmentSubmissionResponse])
 async def get_my_submissions(
-    current_user=Depends(require_role("student")),
-    _=Depends(require_tenant),
+    current_user=REQUIRE_STUDENT,
 ):
     submissions = await get_submissions_by_student(
         student_id=current_user["user_id"],
         tenant_id=current_user["tenant_id"],
     )
-    if submissions is None:
-        return []
-    return submissions
+    items = _SUBMISSIONS_ADAPTER.validate_python(submissions or [])
+    return Response(
+        content=_SUBMISSIONS_ADAPTER.dump_json(items), media_type="application/json"
+    )
 
 
 # ===============================
@@ -99,42 +122,62 @@ async def get_my_submissions(
 # ===============================
 @router.get(
     "/assignment/{assignment_id}",
-    response_model=List[AssignmentSubmissionResponse],
+    response_class=StreamingResponse,
+    responses={200: {"model": List[AssignmentSubmissionResponse]}},
 )
 async def get_by_assignment(
     assignment_id: str,
-    current_user=Depends(require_role("teacher", "admin")),
-    _=Depends(require_tenant),
+    current_user=REQUIRE_TEACHER_ADMIN,
 ):
     validate_object_id(assignment_id, "assignmentId")
 
-    submissions = await get_submissions_by_assignment(
+    cursor = get_submissions_by_assignment_cursor(
         assignment_id=assignment_id,
         tenant_id=current_user["tenant_id"],
     )
-    if submissions is None:
-        return []
-    return submissions
+    return stream_submissions(cursor)
+
+
+# ===============================
+# TEACHER / ADMIN: BY MANY ASSIGNMENTS
+# ===============================
+@router.post(
+    "/by-assignments",
+    response_model=Dict[str, List[AssignmentSubmissionResponse]],
+)
+async def get_by_assignments(
+    body: SubmissionsByAssignmentsRequest,
+    current_user=REQUIRE_TEACHER_ADMIN,
+):
+    for assignment_id in body.assignmentIds:
+        validate_object_id(assignment_id, "assignmentId")
+
+    return await get_submissions_by_assignments(
+        assignment_ids=body.assignmentIds,
+        tenant_id=current_user["tenant_id"],
+    )
 
 
 # ===============================
 # TEACHER / ADMIN: GRADE
 # ===============================
-@router.put("/{submission_id}", response_model=AssignmentSubmissionResponse)
+@router.put(
+    "/{submission_id}",
+    response_model=AssignmentSubmissionResponse,
+    response_model_exclude_unset=True,
+)
 async def grade_submission_route(
     submission_id: str,
     update: AssignmentSubmissionUpdate,
-    current_user=Depends(require_role("teacher", "admin")),
-    _=Depends(require_tenant),
+    current_user=REQUIRE_TEACHER_ADMIN,
 ):
     validate_object_id(submission_id, "submissionId")
 
-    if not update or (update.obtainedMarks is None and update.feedback is None):
+    # Empty strings are already None (schema validator), so one dump drops them
+    update_data = update.model_dump(exclude_unset=True, exclude_none=True)
+    if not update_data:
         raise HTTPException(status_code=400, detail="Nothing to update")
 
-    # Clean empty strings
-    update_data = clean_updates(update.model_dump(exclude_unset=True))
-
     submission = await grade_submission(
         submission_id=submission_id,
         tenant_id=current_user["tenant_id"],
@@ -154,8 +197,7 @@ async def grade_submission_route(
 @router.delete("/{submission_id}")
 async def delete_submission_route(
     submission_id: str,
-    current_user=Depends(require_role("admin")),
-    _=Depends(require_tenant),
+    current_user=REQUIRE_ADMIN,
 ):
     validate_object_id(submission_id, "submissionId")
 
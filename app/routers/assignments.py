@@ -1,15 +1,17 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException
-from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
 
-from app.auth.dependencies import require_role, require_tenant
+from app.auth.dependencies import require_role_and_tenant
+from app.crud import validate_object_id
 from app.schemas.assignments import (
     AssignmentCreate,
     AssignmentListResponse,
     AssignmentUpdate,
     AssignmentResponse,
 )
+from app.utils.etag import body_etag_headers, is_not_modified
 from app.crud.assignments import (
     create_assignment,
     get_all_assignments,
@@ -18,21 +20,22 @@ from app.crud.assignments import (
     delete_assignment,
 )
 
-router = APIRouter(prefix="/assignments", tags=["Assignments"])
+router = APIRouter(
+    prefix="/assignments",
+    tags=["Assignments"],
+    default_response_class=ORJSONResponse,
+)
 
 
-def validate_object_id(id: str, name: str = "id"):
-    if not ObjectId.is_valid(id):
-        raise HTTPException(
-            status_code=400, detail=f"Invalid ObjectId format for {name}"
-        )
+# Shared dependency instances: one object per role set across all routes
+REQUIRE_TEACHER = Depends(require_role_and_tenant("teacher"))
+REQUIRE_ANY_MEMBER = Depends(require_role_and_tenant("teacher", "admin", "student"))
 
 
 @router.post("/", response_model=AssignmentResponse)
 async def create_assignment_route(
     data: AssignmentCreate,
-    current_user=Depends(require_role("teacher")),
-    _=Depends(require_tenant),  # Enforce tenant for creation
+    current_user=REQUIRE_TEACHER,
 ):
     validate_object_id(data.courseId, "courseId")
 
@@ -54,13 +57,13 @@ async def get_all_assignments_route(
     order: int = -1,
     page: int = 1,
     limit: int = 10,
-    current_user=Depends(require_role("teacher", "admin", "student")),
-    _=Depends(require_tenant),  # Enforce tenant for listing
+    current_user=REQUIRE_ANY_MEMBER,
 ):
     if courseId:
         validate_object_id(courseId, "courseId")
 
-    return await get_all_assignments(
+    # serialize_assignment already emits the response shape; skip re-validation
+    result = await get_all_assignments(
         search=search,
         tenant_id=current_user["tenant_id"],  # from token
         teacher_id=(
@@ -75,37 +78,38 @@ async def get_all_assignments_route(
         page=page,
         limit=limit,
     )
+    return ORJSONResponse(result)
 
 
 @router.get("/{id}", response_model=AssignmentResponse)
 async def get_assignment_route(
     id: str,
-    current_user=Depends(require_role("teacher", "admin", "student")),
-    _=Depends(require_tenant),  # Enforce tenant for fetching single assignment
+    request: Request,
+    current_user=REQUIRE_ANY_MEMBER,
 ):
     validate_object_id(id, "assignmentId")
 
-    assignment = await get_assignment(
-        assignment_id=id,
-        tenant_id=current_user["tenant_id"],
-    )
+    assignment = await get_assignment(id, tenant_id=current_user["tenant_id"])
 
     if not assignment:
         raise HTTPException(404, "Assignment not found")
 
-    return assignment
+    # Hash the body: courseName is joined from courses
+    headers = body_etag_headers(assignment)
+    if is_not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(assignment, headers=headers)
 
 
-@router.put("/{id}", response_model=AssignmentResponse)
+@router.put("/{id}", response_model=AssignmentResponse, response_model_exclude_unset=True)
 async def update_assignment_route(
     id: str,
     updates: AssignmentUpdate,
-    current_user=Depends(require_role("teacher")),
-    _=Depends(require_tenant),  # Enforce tenant for update
+    current_user=REQUIRE_TEACHER,
 ):
     validate_object_id(id, "assignmentId")
 
-    update_data = updates.model_dump(exclude_unset=True)
+    update_data = updates.model_dump(exclude_unset=True, exclude_none=True)
 
     if "status" in update_data and update_data["status"] not in ["active", "inactive"]:
         raise HTTPException(400, "Invalid status value")
@@ -114,7 +118,10 @@ async def update_assignment_route(
     update_data.pop("teacherId", None)
     update_data.pop("tenantId", None)
 
-    update_data["updatedAt"] = datetime.utcnow()
+    if not update_data:
+        raise HTTPException(400, "Nothing to update")
+
+    update_data["updatedAt"] = datetime.now(timezone.utc)
 
     result = await update_assignment(
         assignment_id=id,
@@ -134,8 +141,7 @@ async def update_assignment_route(
 @router.delete("/{id}")
 async def delete_assignment_route(
     id: str,
-    current_user=Depends(require_role("teacher")),
-    _=Depends(require_tenant),  # Enforce tenant for deletion
+    current_user=REQUIRE_TEACHER,
 ):
     validate_object_id(id, "assignmentId")
 
@@ -1,3 +1,5 @@
+import asyncio
+from bson import ObjectId
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from app.auth.auth_service import login_user
@@ -5,6 +7,9 @@ from app.schemas.tenants import TenantCreate
 from app.schemas.users import AdminSignupRequest
 from app.crud import users, admins
 from app.crud.tenants import create_tenant
+from app.db.database import tenants_collection, users_collection
+from app.utils.cache import invalidate_tenant
+from app.utils.security import hash_password
 
 router = APIRouter(prefix="/auth/admin", tags=["Admin Authentication"])
 
@@ -12,6 +17,12 @@ router = APIRouter(prefix="/auth/admin", tags=["Admin Authentication"])
 @router.post("/signup", status_code=status.HTTP_201_CREATED)
 async def signup_admin(payload: AdminSignupRequest):
 
+    if payload.role != "admin":
+        raise HTTPException(403, "This endpoint is only for admin signup")
+
+    # bcrypt is CPU-bound; hash on a worker thread while the tenant is inserted
+    hash_task = asyncio.create_task(asyncio.to_thread(hash_password, payload.password))
+
     # Create Tenant using tenant CRUD
     tenant_data = {
         "tenantName": payload.tenantName,
@@ -19,18 +30,29 @@ async def signup_admin(payload: AdminSignupRequest):
         "adminEmail": payload.email,
         # "subscriptionId": payload.subscriptionId | None,
     }
-    tenant = await create_tenant(TenantCreate(**tenant_data))
-
-    if payload.role != "admin":
-        raise HTTPException(403, "This endpoint is only for admin signup")
+    try:
+        tenant = await create_tenant(TenantCreate(**tenant_data))
+    except Exception:
+        hash_task.cancel()
+        raise
 
     user_data = payload.model_dump()
     user_data["role"] = "admin"  # assign role internally
     user_data["tenantId"] = tenant["id"]  # assign created tenant
-    user = await users.create_user(user_data)
-
-    # Create admin profile
-    await admins.create_admin_profile(user["id"], tenant["id"])
+    user_data["password"] = await hash_task
+
+    # User first, then its admin profile; if either fails, remove the user
+    # and the tenant created above so no half-registered admin is left behind
+    try:
+        user = await users.create_user(user_data, password_hashed=True)
+        await admins.create_admin_profile(user["id"], tenant["id"])
+    except Exception:
+        # insert_one sets _id on user_data as soon as the insert is attempted
+        if "_id" in user_data:
+            await users_collection.delete_one({"_id": user_data["_id"]})
+        await tenants_collection.delete_one({"_id": ObjectId(tenant["id"])})
+        invalidate_tenant(tenant["id"])
+        raise
 
     return {
         "message": "Admin and tenant created successfully",
@@ -13,7 +13,7 @@ async def signup_student(payload: UserCreate):
     if payload.role != "student":
         raise HTTPException(403, "This endpoint is only for student signup")
 
-    user = await users.create_user(payload.dict())
+    user = await users.create_user(payload.model_dump())
 
     if payload.role == "student":
         await students.create_student(user["id"])
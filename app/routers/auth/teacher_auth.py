@@ -13,7 +13,7 @@ async def signup_teacher(payload: UserCreate):
     if payload.role != "teacher":
         raise HTTPException(403, "This endpoint is only for teacher signup")
 
-    user = await users.create_user(payload.dict())
+    user = await users.create_user(payload.model_dump())
 
     if payload.role == "teacher":
         await teachers.create_teacher(user["id"])
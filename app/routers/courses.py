@@ -1,6 +1,6 @@
 
 
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
 from typing import List, Optional
 from app.schemas.courses import (
     CourseCreate, 
@@ -14,10 +14,22 @@ from app.schemas.courses import (
 from app.crud.courses import course_crud
 
 from app.auth.dependencies import get_current_user
+from app.utils.etag import body_etag_headers, is_not_modified
 
 router = APIRouter(prefix="/courses", tags=["courses"], dependencies=[Depends(get_current_user)])
 
 
+def _raise_from_result(message: str, tenant_status: int = 403):
+    """Map a failed CRUD result message onto the matching HTTP error."""
+    if "Invalid" in message and "format" in message:
+        raise HTTPException(status_code=400, detail=message)
+    if "not found" in message:
+        raise HTTPException(status_code=404, detail=message)
+    if "different tenant" in message:
+        raise HTTPException(status_code=tenant_status, detail=message)
+    raise HTTPException(status_code=400, detail=message)
+
+
 @router.post("/", response_model=CourseResponse, status_code=201)
 async def create_course(course: CourseCreate):
     """
@@ -78,6 +90,8 @@ async def get_courses(
 @router.get("/{course_id}", response_model=CourseResponse)
 async def get_course(
     course_id: str,
+    request: Request,
+    response: Response,
     tenantId: str = Query(..., description="Tenant ID (required)") 
 ):
     """
@@ -89,23 +103,22 @@ async def get_course(
     - 400: Invalid course ID or tenant ID format
     - 403: Course belongs to different tenant
     - 404: Course not found
+    - 304: Client's copy (If-None-Match) is current
     - 200: Course details
     """
     result = await course_crud.get_course_by_id(course_id, tenantId)
     
     if not result["success"]:
-        message = result["message"]
-        
-        if "Invalid" in message and "format" in message:
-            raise HTTPException(status_code=400, detail=message)
-        elif "different tenant" in message:
-            raise HTTPException(status_code=403, detail=message)
-        elif "not found" in message:
-            raise HTTPException(status_code=404, detail=message)
-        else:
-            raise HTTPException(status_code=400, detail=message)
+        _raise_from_result(result["message"])
     
-    return result["course"]
+    course = result["course"]
+    # Hash the body: instructorName is joined from users and can change
+    # without touching the course's updatedAt
+    headers = body_etag_headers(course)
+    if is_not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return course
 
 
 @router.put("/{course_id}", response_model=CourseResponse)
@@ -158,14 +171,7 @@ async def delete_course(
     result = await course_crud.delete_course(course_id, tenantId)
     
     if not result["success"]:
-        message = result["message"]
-        
-        if "Invalid" in message and "format" in message:
-            raise HTTPException(status_code=400, detail=message)
-        elif "not found" in message or "different tenant" in message:
-            raise HTTPException(status_code=404, detail=message)
-        else:
-            raise HTTPException(status_code=400, detail=message)
+        _raise_from_result(result["message"], tenant_status=404)
     
     return None
 
@@ -238,14 +244,7 @@ async def get_course_students(
     result = await course_crud.get_enrolled_students(course_id, tenantId)
     
     if not result["success"]:
-        message = result["message"]
-        
-        if "Invalid" in message and "format" in message:
-            raise HTTPException(status_code=400, detail=message)
-        elif "not found" in message or "different tenant" in message:
-            raise HTTPException(status_code=404, detail=message)
-        else:
-            raise HTTPException(status_code=400, detail=message)
+        _raise_from_result(result["message"], tenant_status=404)
     
     return result["students"]
 
@@ -292,16 +291,7 @@ async def get_student_courses(
     result = await course_crud.get_student_courses(student_id, tenantId)
     
     if not result["success"]:
-        message = result["message"]
-        
-        if "Invalid" in message and "format" in message:
-            raise HTTPException(status_code=400, detail=message)
-        elif "different tenant" in message:
-            raise HTTPException(status_code=403, detail=message)
-        elif "not found" in message:
-            raise HTTPException(status_code=404, detail=message)
-        else:
-            raise HTTPException(status_code=400, detail=message)
+        _raise_from_result(result["message"])
     
     return result["courses"]
 
@@ -333,14 +323,7 @@ async def reorder_lessons(
     )
     
     if not result["success"]:
-        message = result["message"]
-        
-        if "Invalid" in message and "format" in message:
-            raise HTTPException(status_code=400, detail=message)
-        elif "not found" in message:
-            raise HTTPException(status_code=404, detail=message)
-        else:
-            raise HTTPException(status_code=400, detail=message)
+        _raise_from_result(result["message"])
     
     return result["course"]
 
@@ -369,14 +352,7 @@ async def reorder_modules(
     )
     
     if not result["success"]:
-        message = result["message"]
-        
-        if "Invalid" in message and "format" in message:
-            raise HTTPException(status_code=400, detail=message)
-        elif "not found" in message:
-            raise HTTPException(status_code=404, detail=message)
-        else:
-            raise HTTPException(status_code=400, detail=message)
+        _raise_from_result(result["message"])
     
     return result["course"]
 
@@ -405,13 +381,6 @@ async def publish_course(
     )
     
     if not result["success"]:
-        message = result["message"]
-        
-        if "Invalid" in message and "format" in message:
-            raise HTTPException(status_code=400, detail=message)
-        elif "not found" in message:
-            raise HTTPException(status_code=404, detail=message)
-        else:
-            raise HTTPException(status_code=400, detail=message)
+        _raise_from_result(result["message"])
     
     return result["course"]
\ No newline at end of file
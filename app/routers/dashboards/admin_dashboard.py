@@ -1,26 +1,47 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 from app.crud.dashboards import admin_dashboard as crud_admin
-from app.auth.dependencies import get_current_user, require_role
+from app.auth.dependencies import require_role
 
-router = APIRouter(prefix="/admin/dashboard", tags=["Admin Dashboard"])
+router = APIRouter(
+    prefix="/admin/dashboard",
+    tags=["Admin Dashboard"],
+    default_response_class=ORJSONResponse,
+)
 
-# Only admin and super-admin can access these endpoints
-admin_roles = ["admin", "super-admin"]
+# Only admin and super-admin can access these endpoints. One shared Depends
+# instance: require_role returns the same callable for the same roles, and it
+# depends on get_current_user by identity, so auth resolves once per request.
+REQUIRE_ADMIN = Depends(require_role("admin", "super-admin"))
+
+
+@router.get("/counts")
+async def get_counts(current_user=REQUIRE_ADMIN):
+    return await crud_admin.get_counts(current_user["tenant_id"])
 
 
 @router.get("/teachers")
-async def list_teachers(current_user=Depends(require_role(*admin_roles))):
-    teachers = await crud_admin.get_all_teachers(current_user["tenant_id"])
-    return {"total": len(teachers), "teachers": teachers}
+async def list_teachers(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user=REQUIRE_ADMIN,
+):
+    return await crud_admin.get_all_teachers(current_user["tenant_id"], skip, limit)
 
 
 @router.get("/students")
-async def list_students(current_user=Depends(require_role(*admin_roles))):
-    students = await crud_admin.get_all_students(current_user["tenant_id"])
-    return {"total": len(students), "students": students}
+async def list_students(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user=REQUIRE_ADMIN,
+):
+    return await crud_admin.get_all_students(current_user["tenant_id"], skip, limit)
 
 
 @router.get("/courses")
-async def list_courses(current_user=Depends(require_role(*admin_roles))):
-    courses = await crud_admin.get_all_courses(current_user["tenant_id"])
-    return {"total": len(courses), "courses": courses}
+async def list_courses(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user=REQUIRE_ADMIN,
+):
+    return await crud_admin.get_all_courses(current_user["tenant_id"], skip, limit)
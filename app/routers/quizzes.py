@@ -1,6 +1,6 @@
-from fastapi import APIRouter, HTTPException, Query, status, Depends
-from bson import ObjectId
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status, Depends
 from typing import Optional
+from pydantic import TypeAdapter
 
 from app.schemas.quizzes import QuizCreate, QuizUpdate, QuizResponse
 from app.crud.quizzes import (
@@ -13,12 +13,26 @@ from app.crud.quizzes import (
     has_quiz_submissions
 )
 from app.auth.dependencies import get_current_user
+from app.crud import validate_object_id
+from app.utils.etag import etag_headers, is_not_modified
 
 router = APIRouter(
     prefix="/quizzes",
     tags=["Quizzes"]
 )
 
+# Built once at import; validates and encodes a whole quiz list in one pydantic-core call
+_QUIZ_LIST_ADAPTER = TypeAdapter(list[QuizResponse])
+
+
+def _quiz_list_response(quizzes: list, headers: Optional[dict] = None) -> Response:
+    items = _QUIZ_LIST_ADAPTER.validate_python(quizzes)
+    return Response(
+        content=_QUIZ_LIST_ADAPTER.dump_json(items),
+        media_type="application/json",
+        headers=headers,
+    )
+
 # ------------------ STUDENT SPECIFIC ------------------
 @router.get("/student/me", response_model=list[QuizResponse])
 async def get_my_quizzes(current_user=Depends(get_current_user)):
@@ -28,36 +42,34 @@ async def get_my_quizzes(current_user=Depends(get_current_user)):
     if current_user["role"] != "student":
         raise HTTPException(status_code=403, detail="Only students can access this endpoint")
         
-    return await get_student_quizzes(
+    quizzes = await get_student_quizzes(
         user_id=current_user["user_id"],
         tenant_id=current_user["tenant_id"]
     )
+    return _quiz_list_response(quizzes)
 
 
-# ------------------ VALIDATION ------------------
-def _validate_objectid(_id: str):
-    """Ensures that incoming IDs are valid MongoDB ObjectIds."""
-    if not ObjectId.is_valid(_id):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid ID format provided")
-
 # ------------------ CREATE QUIZ ------------------
 @router.post("/", response_model=QuizResponse, summary="Create a new quiz")
 async def create_quiz_route(data: QuizCreate):
     # Validate IDs coming from body
-    _validate_objectid(data.courseId)
-    _validate_objectid(data.teacherId)
-    _validate_objectid(data.tenantId)
+    for name in ("courseId", "teacherId", "tenantId"):
+        validate_object_id(getattr(data, name), name)
 
     # Call CRUD function
     return await create_quiz(data)
 
 # ------------------ GET QUIZ BY ID ------------------
 @router.get("/{quiz_id}", response_model=QuizResponse, summary="Get quiz by ID")
-async def get_one(quiz_id: str):
-    _validate_objectid(quiz_id)
+async def get_one(quiz_id: str, request: Request, response: Response):
+    validate_object_id(quiz_id, "quiz_id")
     quiz = await get_quiz(quiz_id)
     if not quiz:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quiz not found")
+    headers = etag_headers(quiz)
+    if is_not_modified(request, headers):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
     return quiz
 
 
@@ -70,22 +82,25 @@ async def list_quizzes(
     course_id: Optional[str] = None,
     search: Optional[str] = Query(None, description="search in description"),
     sort: Optional[str] = Query("createdAt", description="Sort results: 'name' or 'createdAt or '-createdAt'"),
-    page: int = Query(1, ge=1),
-    limit: int = Query(10, ge=1, le=100)
+    page: int = Query(1, ge=1, description="Offset page; ignored once a cursor is sent"),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page")
 ):
 
     # Validate IDs only if provided
     if tenant_id: 
-        _validate_objectid(tenant_id)
+        validate_object_id(tenant_id, "tenant_id")
     if teacher_id: 
-        _validate_objectid(teacher_id)
+        validate_object_id(teacher_id, "teacher_id")
     if course_id: 
-        _validate_objectid(course_id)
+        validate_object_id(course_id, "course_id")
 
     # Forward to CRUD function
-    return await get_quizzes_filtered(
-        tenant_id, teacher_id, course_id, search, sort, page, limit
+    quizzes, next_cursor = await get_quizzes_filtered(
+        tenant_id, teacher_id, course_id, search, sort, page, limit, cursor
     )
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return _quiz_list_response(quizzes, headers)
 
 # ------------------ UPDATE QUIZ ------------------
 @router.patch("/{quiz_id}", response_model=QuizResponse, summary="Update/Patch quiz by ID")
@@ -94,8 +109,8 @@ async def update_quiz_route(
     updates: QuizUpdate,
     teacher_id: str = Query(..., description="Teacher ID for authorization")
 ):
-    _validate_objectid(quiz_id)
-    _validate_objectid(teacher_id)
+    validate_object_id(quiz_id, "quiz_id")
+    validate_object_id(teacher_id, "teacher_id")
 
     result = await update_quiz(quiz_id, teacher_id, updates.model_dump(exclude_unset=True))
 
@@ -118,7 +133,7 @@ async def check_quiz_submissions(quiz_id: str):
     Check if a quiz has any student submissions.
     Useful for frontend to warn teachers before editing.
     """
-    _validate_objectid(quiz_id)
+    validate_object_id(quiz_id, "quiz_id")
     has_subs = await has_quiz_submissions(quiz_id)
     return {
         "quizId": quiz_id,
@@ -133,8 +148,8 @@ async def delete_quiz_route(
     quiz_id: str,
     teacher_id: str = Query(..., description="Teacher ID for authorization")
 ):
-    _validate_objectid(quiz_id)
-    _validate_objectid(teacher_id)
+    validate_object_id(quiz_id, "quiz_id")
+    validate_object_id(teacher_id, "teacher_id")
 
     result = await delete_quiz(quiz_id, teacher_id)
 
@@ -1,17 +1,44 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from bson import ObjectId
+from pymongo import ReturnDocument
 from datetime import datetime
 from dotenv import load_dotenv
+from app.schemas.admins import AdminResponse, AdminUpdatePassword, AdminUpdateProfile
 from app.schemas.teachers import TeacherUpdate
 from app.crud import admins as crud_admin
+from app.db.database import courses_collection, students_collection
 from app.crud.students import delete_student as crud_delete_student
 from app.crud.teachers import delete_teacher as crud_delete_teacher, update_teacher as crud_update_teacher
-from app.auth.dependencies import require_role
+from app.auth.dependencies import get_current_admin_id, require_role
+from app.utils.cache import invalidate_tenant_counts
 
 load_dotenv()
 
 router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_role("admin"))])
 
+# ------------------ Profile (Me) ------------------
+
+@router.get("/me", response_model=AdminResponse)
+async def get_profile(admin_id: str = Depends(get_current_admin_id)):
+    admin = await crud_admin.get_admin_profile(admin_id)
+    if not admin:
+        raise HTTPException(status_code=404, detail="Admin not found")
+    return admin
+
+@router.patch("/me", response_model=AdminResponse)
+async def update_profile(data: AdminUpdateProfile, admin_id: str = Depends(get_current_admin_id)):
+    admin = await crud_admin.update_admin_profile(admin_id, data)
+    if not admin:
+        raise HTTPException(status_code=404, detail="Admin not found")
+    return admin
+
+@router.put("/me/password", response_model=AdminResponse)
+async def update_password(data: AdminUpdatePassword, admin_id: str = Depends(get_current_admin_id)):
+    try:
+        return await crud_admin.update_admin_password(admin_id, data.oldPassword, data.newPassword)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 # ------------------ Dashboard ------------------
 
 @router.get("/teachers")
@@ -35,16 +62,20 @@ async def list_courses():
 
 @router.patch("/students/{student_id}")
 async def update_student(student_id: str, data: dict):
-    student = await crud_admin.db.students.find_one({"_id": ObjectId(student_id)})
-    if not student:
-        raise HTTPException(status_code=404, detail="Student not found")
-
     update_data = {k: v for k, v in data.items() if v is not None}
     if update_data:
         update_data["updatedAt"] = datetime.utcnow()
-        await crud_admin.db.students.update_one({"_id": ObjectId(student_id)}, {"$set": update_data})
-
-    updated_student = await crud_admin.db.students.find_one({"_id": ObjectId(student_id)})
+        # Update and fetch in one round trip; None means the student doesn't exist
+        updated_student = await students_collection.find_one_and_update(
+            {"_id": ObjectId(student_id)},
+            {"$set": update_data},
+            return_document=ReturnDocument.AFTER,
+        )
+    else:
+        updated_student = await students_collection.find_one({"_id": ObjectId(student_id)})
+
+    if not updated_student:
+        raise HTTPException(status_code=404, detail="Student not found")
 
     return {
         "id": str(updated_student["_id"]),
@@ -67,7 +98,7 @@ async def delete_student(student_id: str, tenant_id: str):
 
 @router.put("/update-teacher/{id}")
 async def admin_update_teacher(id: str, updates: TeacherUpdate):
-    updated = await crud_update_teacher(id, updates.dict(exclude_unset=True))
+    updated = await crud_update_teacher(id, updates.model_dump(exclude_unset=True))
     if not updated:
         raise HTTPException(404, "Teacher not found")
     return updated
@@ -84,16 +115,20 @@ async def delete_teacher(teacher_id: str):
 
 @router.patch("/courses/{course_id}")
 async def update_course(course_id: str, data: dict):
-    course = await crud_admin.db.courses.find_one({"_id": ObjectId(course_id)})
-    if not course:
-        raise HTTPException(status_code=404, detail="Course not found")
-
     update_data = {k: v for k, v in data.items() if v is not None}
     if update_data:
         update_data["updatedAt"] = datetime.utcnow()
-        await crud_admin.db.courses.update_one({"_id": ObjectId(course_id)}, {"$set": update_data})
-
-    updated_course = await crud_admin.db.courses.find_one({"_id": ObjectId(course_id)})
+        # Update and fetch in one round trip; None means the course doesn't exist
+        updated_course = await courses_collection.find_one_and_update(
+            {"_id": ObjectId(course_id)},
+            {"$set": update_data},
+            return_document=ReturnDocument.AFTER,
+        )
+    else:
+        updated_course = await courses_collection.find_one({"_id": ObjectId(course_id)})
+
+    if not updated_course:
+        raise HTTPException(status_code=404, detail="Course not found")
 
     return {
         "id": str(updated_course["_id"]),
@@ -105,7 +140,10 @@ async def update_course(course_id: str, data: dict):
 
 @router.delete("/courses/{course_id}")
 async def delete_course(course_id: str):
-    result = await crud_admin.db.courses.delete_one({"_id": ObjectId(course_id)})
-    if result.deleted_count == 0:
+    deleted = await courses_collection.find_one_and_delete(
+        {"_id": ObjectId(course_id)}, projection={"tenantId": 1}
+    )
+    if not deleted:
         raise HTTPException(status_code=404, detail="Course not found")
+    invalidate_tenant_counts(deleted.get("tenantId"))
     return {"message": "Course deleted successfully"}
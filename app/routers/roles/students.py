@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Body
 from app.schemas.students import (
     StudentCreate,
     StudentLogin,
@@ -10,6 +10,9 @@ from app.auth.dependencies import get_current_user
 
 router = APIRouter(prefix="/students", tags=["Students"])
 
+# Each row costs a bcrypt hash on a worker thread; keep one request bounded
+MAX_BULK_STUDENTS = 100
+
 
 # -----------------------------------------------------
 # PROFILE (ME)
@@ -58,6 +61,25 @@ async def create_student(tenantId: str, student: StudentCreate):
     return StudentResponse(**new_student)
 
 
+# -----------------------------------------------------
+# BULK CREATE STUDENTS  (POST /students/{tenantId}/bulk)
+# -----------------------------------------------------
+@router.post("/{tenantId}/bulk", response_model=list[StudentResponse], dependencies=[Depends(get_current_user)])
+async def bulk_create_students(
+    tenantId: str, students: list[StudentCreate] = Body(..., max_length=MAX_BULK_STUDENTS)
+):
+
+    created = await crud_student.create_students_bulk(students, tenantId)
+
+    result = []
+    for s in created:
+        s["id"] = s["_id"]
+        del s["_id"]
+        result.append(StudentResponse(**s))
+
+    return result
+
+
 # -----------------------------------------------------
 # LIST STUDENTS FOR TENANT
 # -----------------------------------------------------
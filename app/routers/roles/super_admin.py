@@ -26,7 +26,7 @@ async def update_my_profile(
 ):
 
     updated = await update_superadmin(
-        current_user["user_id"], update.dict(exclude_unset=True)
+        current_user["user_id"], update.model_dump(exclude_unset=True)
     )
 
     if not updated:
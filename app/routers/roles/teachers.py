@@ -1,23 +1,33 @@
+import logging
+
+import orjson
 from fastapi import APIRouter, HTTPException, Depends
-from bson import ObjectId
+from fastapi.responses import StreamingResponse
 from app.schemas.teachers import (
     TeacherCreate,
     TeacherUpdate,
     TeacherResponse,
     ChangePassword,
 )
+from app.crud import validate_object_id
 from app.crud.teachers import (
     create_teacher,
-    get_all_teachers,
+    get_all_teachers_cursor,
+    serialize_teacher_row,
     get_teacher,
     update_teacher,
     delete_teacher,
     change_password,
     get_teacher_students,
     get_teacher_dashboard,
+    get_teacher_overview,
+    get_teacher_by_user,
+    update_teacher_profile,
 )
 from app.auth.dependencies import get_current_user, require_role
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
     prefix="/teachers", tags=["Teachers"], dependencies=[Depends(get_current_user)]
 )
@@ -35,21 +45,12 @@ async def get_my_profile(current_user=Depends(get_current_user)):
         if isinstance(current_user, dict)
         else current_user.id
     )
-    print(f"DEBUG: Fetching teacher profile for UserID: {uid}")
-
-    t = await get_teacher_students(
-        uid
-    )  # wait, get_teacher_students is lists. We need get_teacher_by_user
-    # We need to import get_teacher_by_user from crud
-    from app.crud.teachers import get_teacher_by_user, update_teacher_profile
 
     teacher = await get_teacher_by_user(uid)
     if not teacher:
-        print(f"DEBUG: Teacher profile NOT FOUND for UserID: {uid}")
         # If user is teacher but no teacher profile exists?
         raise HTTPException(404, "Teacher profile not found")
 
-    print(f"DEBUG: Teacher profile found: {teacher.get('id')}")
     return teacher
 
 
@@ -62,19 +63,12 @@ async def update_my_profile(
         if isinstance(current_user, dict)
         else current_user.id
     )
-    from app.crud.teachers import update_teacher_profile
-
-    updated = await update_teacher_profile(uid, updates.dict(exclude_unset=True))
+    updated = await update_teacher_profile(uid, updates.model_dump(exclude_unset=True))
     if not updated:
         raise HTTPException(404, "Teacher profile not found")
     return updated
 
 
-def validate_object_id(id: str, name="id"):
-    if not ObjectId.is_valid(id):
-        raise HTTPException(400, f"Invalid ObjectId for {name}")
-
-
 # ------------------ CRUD ------------------
 
 
@@ -83,9 +77,34 @@ async def create_teacher_route(data: TeacherCreate):
     return await create_teacher(data)
 
 
-@router.get("/", response_model=list[TeacherResponse])
+@router.get(
+    "/",
+    response_class=StreamingResponse,
+    responses={200: {"model": list[TeacherResponse]}},
+)
 async def get_all_teachers_route():
-    return await get_all_teachers()
+    # Rows are already shaped like TeacherResponse; stream them as a JSON array.
+    # Pull the first row (and with it the cursor's first batch) before any
+    # bytes go out, so a failing query still surfaces as a 500.
+    rows = get_all_teachers_cursor().__aiter__()
+    first = await anext(rows, None)
+
+    async def gen():
+        yield b"["
+        if first is not None:
+            yield orjson.dumps(serialize_teacher_row(first))
+            try:
+                async for doc in rows:
+                    yield b","
+                    yield orjson.dumps(serialize_teacher_row(doc))
+            except Exception:
+                # The 200 is already sent; abort the body rather than close the
+                # array, so the client sees a broken transfer, not a short list
+                logger.exception("Teacher list stream failed mid-response")
+                raise
+        yield b"]"
+
+    return StreamingResponse(gen(), media_type="application/json")
 
 
 @router.get("/{id}", response_model=TeacherResponse)
@@ -100,7 +119,7 @@ async def get_teacher_route(id: str):
 @router.put("/{id}", response_model=TeacherResponse)
 async def update_teacher_route(id: str, updates: TeacherUpdate):
     validate_object_id(id)
-    updated = await update_teacher(id, updates.dict(exclude_unset=True))
+    updated = await update_teacher(id, updates.model_dump(exclude_unset=True))
     if not updated:
         raise HTTPException(404, "Teacher not found")
     return updated
@@ -143,19 +162,18 @@ async def teacher_dashboard_route(id: str):
     return stats
 
 
-# ------------------ Placeholder Integration ------------------
-
-
-@router.get("/{id}/assignments")
-async def teacher_assignments(id: str):
-    return {"message": f"Fetch assignments for teacher {id}"}
-
-
-@router.get("/{id}/courses")
-async def teacher_courses(id: str):
-    return {"message": f"Fetch courses for teacher {id}"}
-
-
-@router.get("/{id}/quizzes")
-async def teacher_quizzes(id: str):
-    return {"message": f"Fetch quizzes for teacher {id}"}
+@router.get("/{id}/overview")
+async def teacher_overview_route(
+    id: str, current_user=Depends(require_role("teacher", "admin", "super-admin"))
+):
+    validate_object_id(id)
+    # Quizzes include their questions: scope everyone but super-admins to their tenant
+    tenant_id = None
+    if current_user["role"] != "super-admin":
+        tenant_id = current_user.get("tenant_id")
+        if not tenant_id:
+            raise HTTPException(403, "Tenant context required for this operation")
+    overview = await get_teacher_overview(id, tenant_id)
+    if overview is None:
+        raise HTTPException(404, "Teacher not found")
+    return overview
@@ -1,22 +1,31 @@
 # app/routers/subscription.py
 from fastapi import APIRouter, HTTPException
 from typing import List
-from app.schemas.subscription import Subscription
+from app.schemas.subscription import Subscription, SubscriptionUpdate
 from app.crud.subscription import (
     fetch_subscriptions,
     fetch_subscription_by_tenant,
     create_subscription as crud_create_sub,
+    create_subscriptions_bulk as crud_create_subs_bulk,
     update_subscription as crud_update_sub,
     delete_subscription as crud_delete_sub
 )
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
+from pydantic import TypeAdapter
 from app.auth.dependencies import require_role
+from app.utils.cache import cache_response, subscription_list_cache
 
 router = APIRouter(prefix="/subscriptions", tags=["Subscriptions"], dependencies=[Depends(require_role("admin", "super_admin"))])
 
+_SUBSCRIPTION_LIST_ADAPTER = TypeAdapter(List[Subscription])
+
+# Pre-encoded body for the by-tenant lookup's miss path, which onboarding polls
+_NOT_FOUND_SUB_BODY = b'{"detail":"Subscription not found"}'
+
 # Get all subscriptions
 @router.get("/", response_model=List[Subscription])
+@cache_response(subscription_list_cache, _SUBSCRIPTION_LIST_ADAPTER)
 async def get_subscriptions():
     return await fetch_subscriptions()
 
@@ -25,7 +34,7 @@ async def get_subscriptions():
 async def get_subscription(tenant_id: str):
     sub = await fetch_subscription_by_tenant(tenant_id)
     if not sub:
-        raise HTTPException(status_code=404, detail="Subscription not found")
+        return Response(_NOT_FOUND_SUB_BODY, status_code=404, media_type="application/json")
     return sub
 
 # Create a new subscription
@@ -33,9 +42,14 @@ async def get_subscription(tenant_id: str):
 async def create_subscription(sub: Subscription):
     return await crud_create_sub(sub)
 
+# Create many subscriptions in one insert
+@router.post("/bulk", response_model=List[Subscription])
+async def bulk_create_subscriptions(subs: List[Subscription]):
+    return await crud_create_subs_bulk(subs)
+
 # Update subscription by tenantId
 @router.put("/{tenant_id}", response_model=Subscription)
-async def update_subscription(tenant_id: str, sub: Subscription):
+async def update_subscription(tenant_id: str, sub: SubscriptionUpdate):
     updated_sub = await crud_update_sub(tenant_id, sub)
     if not updated_sub:
         raise HTTPException(status_code=404, detail="Subscription not found")
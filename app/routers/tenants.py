@@ -1,9 +1,11 @@
-from fastapi import HTTPException, status, APIRouter, Query, Depends
+from fastapi import HTTPException, status, APIRouter, Query, Depends, Response
 from app.auth.dependencies import require_role
-from bson import ObjectId
 from typing import Optional
+from pydantic import TypeAdapter
 from app.schemas.tenants import TenantResponse, TenantCreate, TenantUpdate
+from app.crud import validate_object_id
 from app.crud.tenants import create_tenant, get_all_tenants, delete_tenant, get_tenant, update_tenant
+from app.utils.cache import cache_response, tenant_list_cache
 
 router = APIRouter(
     prefix="/tenants",
@@ -11,15 +13,10 @@ router = APIRouter(
     dependencies=[Depends(require_role("super_admin"))]
 )
 
-# -------------------------
-# Validate ObjectId before using it
-# -------------------------
-def _validate_objectid(_id: str):
-    if not ObjectId.is_valid(_id):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid ObjectId"
-        )
+_TENANT_LIST_ADAPTER = TypeAdapter(list[TenantResponse])
+
+# Pre-encoded body for the single-tenant lookup's miss path
+_NOT_FOUND_TENANT_BODY = b'{"detail":"Tenant not found"}'
 
 # # -------------------------
 # # Create a new tenant
@@ -34,11 +31,12 @@ def _validate_objectid(_id: str):
 # Get all tenants (search, filter, sort, pagination)
 # -------------------------
 @router.get("/", response_model=list[TenantResponse], summary="Get all tenants")
+@cache_response(tenant_list_cache, _TENANT_LIST_ADAPTER)
 async def get_all(
     skip: int = Query(0, ge=0, description="Items to skip for pagination"),
     limit: int = Query(10, ge=1, le=100, description="Max tenants to return"),
     status: Optional[str] = Query(None, description="Filter tenants by status"),
-    search: Optional[str] = Query(None, description="Search tenants by tenant name or admin email"),
+    search: Optional[str] = Query(None, description="Case-insensitive prefix search on tenant name or admin email"),
     sort: Optional[str] = Query(None, description="Sort results: 'name' or 'createdAt or '-createdAt'")
 ):
     return await get_all_tenants(skip=skip, limit=limit, status=status, search=search, sort=sort)
@@ -49,11 +47,15 @@ async def get_all(
 # -------------------------
 @router.get("/{tenant_id}", response_model=TenantResponse, summary="Get tenant by ID")
 async def get_one(tenant_id: str):
-    _validate_objectid(tenant_id)
+    validate_object_id(tenant_id, "tenant_id")
 
     tenant = await get_tenant(tenant_id)
     if not tenant:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant not found")
+        return Response(
+            _NOT_FOUND_TENANT_BODY,
+            status_code=status.HTTP_404_NOT_FOUND,
+            media_type="application/json",
+        )
 
     return tenant
 
@@ -63,7 +65,7 @@ async def get_one(tenant_id: str):
 # -------------------------
 @router.patch("/{tenant_id}", response_model=TenantResponse, summary="Patch/Update tenant")
 async def update_one(tenant_id: str, data: TenantUpdate):
-    _validate_objectid(tenant_id)
+    validate_object_id(tenant_id, "tenant_id")
 
     result = await update_tenant(tenant_id, data.model_dump(exclude_unset=True))
     if not result:
@@ -76,7 +78,7 @@ async def update_one(tenant_id: str, data: TenantUpdate):
 # -------------------------
 @router.delete("/{tenant_id}", summary="Delete tenant")
 async def delete_one(tenant_id: str):
-    _validate_objectid(tenant_id)
+    validate_object_id(tenant_id, "tenant_id")
 
     if not await delete_tenant(tenant_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant not found")
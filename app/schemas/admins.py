@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from typing import Optional
 from datetime import datetime
 
@@ -37,8 +37,7 @@ class AdminResponse(BaseModel):
     contactNo: Optional[str] = None
     profileImageURL: Optional[str] = ""
     status: Optional[str] = "active"
-    createdAt: datetime = Field(default_factory=datetime.utcnow())
-    updatedAt: Optional[datetime] = Field(default_factory=datetime.utcnow())
+    createdAt: datetime = Field(default_factory=datetime.utcnow)
+    updatedAt: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,36 +1,5 @@
-# from pydantic import BaseModel
-# from typing import Optional
-# from datetime import datetime
-
-
-# class AssignmentSubmissionCreate(BaseModel):
-#     assignmentId: str
-#     courseId: str
-#     fileUrl: str
-
-
-# class AssignmentSubmissionResponse(BaseModel):
-#     id: str
-#     studentId: str
-#     assignmentId: str
-#     submittedAt: datetime
-#     fileUrl: str
-#     obtainedMarks: Optional[int] = None
-#     feedback: Optional[str] = None
-#     courseId: str
-#     tenantId: str
-#     gradedAt: Optional[datetime] = None
-
-#     model_config = {"from_attributes": True}
-
-
-# class AssignmentSubmissionUpdate(BaseModel):
-#     obtainedMarks: Optional[int] = None
-#     feedback: Optional[str] = None
-
-
 from pydantic import BaseModel, Field, model_validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -43,12 +12,12 @@ class AssignmentSubmissionCreate(BaseModel):
     fileUrl: str = Field(..., min_length=3)
 
     @model_validator(mode="after")
-    def validate_ids(cls, values):
+    def validate_ids(self):
         # Basic safety: IDs must not be empty strings
         for field in ["studentId", "assignmentId", "courseId", "tenantId"]:
-            if not getattr(values, field):
+            if not getattr(self, field):
                 raise ValueError(f"{field} cannot be empty")
-        return values
+        return self
 
 
 class AssignmentSubmissionUpdate(BaseModel):
@@ -58,13 +27,15 @@ class AssignmentSubmissionUpdate(BaseModel):
 
     @model_validator(mode="before")
     def convert_empty_strings_to_none(cls, data):
-        if isinstance(data, dict):
-            for k, v in data.items():
-                if v == "":
-                    data[k] = None
+        if isinstance(data, dict) and any(v == "" for v in data.values()):
+            return {k: (None if v == "" else v) for k, v in data.items()}
         return data
 
 
+class SubmissionsByAssignmentsRequest(BaseModel):
+    assignmentIds: List[str] = Field(..., min_length=1, max_length=500)
+
+
 class AssignmentSubmissionResponse(BaseModel):
     id: str
 
@@ -22,10 +22,10 @@ class AssignmentCreate(BaseModel):
     allowedFormats: List[str] = Field(default_factory=lambda: ["pdf", "docx"])
 
     @model_validator(mode="after")
-    def validate_marks(cls, values):
-        if values.passingMarks > values.totalMarks:
+    def validate_marks(self):
+        if self.passingMarks > self.totalMarks:
             raise ValueError("passingMarks cannot be greater than totalMarks")
-        return values
+        return self
 
 
 class AssignmentUpdate(BaseModel):
@@ -44,21 +44,19 @@ class AssignmentUpdate(BaseModel):
 
     @model_validator(mode="before")
     def convert_empty_strings_to_none(cls, data):
-        if isinstance(data, dict):
-            for key, value in data.items():
-                if value == "":
-                    data[key] = None
+        if isinstance(data, dict) and any(value == "" for value in data.values()):
+            return {key: (None if value == "" else value) for key, value in data.items()}
         return data
 
     @model_validator(mode="after")
-    def validate_marks(cls, values):
+    def validate_marks(self):
         if (
-            values.totalMarks is not None
-            and values.passingMarks is not None
-            and values.passingMarks > values.totalMarks
+            self.totalMarks is not None
+            and self.passingMarks is not None
+            and self.passingMarks > self.totalMarks
         ):
             raise ValueError("passingMarks cannot be greater than totalMarks")
-        return values
+        return self
 
 
 class AssignmentResponse(BaseModel):
@@ -1,22 +1,17 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, PlainSerializer
+from typing import Annotated, Optional, List
 from datetime import datetime
 from bson import ObjectId
 
-class PyObjectId(ObjectId):
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
 
-    @classmethod
-    def validate(cls, v):
-        if not ObjectId.is_valid(v):
-            raise ValueError("Invalid objectid")
-        return ObjectId(v)
+def _object_id_to_str(v):
+    return str(v) if isinstance(v, ObjectId) else v
 
-    @classmethod
-    def __get_pydantic_json_schema__(cls, _schema_generator):
-        return {"type": "string"}
+
+# Id fields: accept raw ObjectIds from Mongo documents, always emit strings
+PyObjectId = Annotated[
+    str, BeforeValidator(_object_id_to_str), PlainSerializer(str, return_type=str)
+]
 
 
 # Schema for a single lesson within a module
@@ -34,7 +29,7 @@ class ModuleSchema(BaseModel):
     title: str
     description: Optional[str] = None
     content: Optional[str] = None
-    lessons: List[LessonSchema] = []
+    lessons: List[LessonSchema] = Field(default_factory=list)
     order: int = 0
 
 # Base schema containing shared fields for all course-related operations
@@ -47,7 +42,7 @@ class CourseBase(BaseModel):
     courseCode: Optional[str] = None
     duration: Optional[str] = None
     thumbnailUrl: Optional[str] = ""
-    modules: List[ModuleSchema] = []
+    modules: List[ModuleSchema] = Field(default_factory=list)
     isPublic: bool = True  # true = in marketplace, false = private 
     isFree: bool = True
     price: Optional[float] = 0
@@ -88,17 +83,15 @@ class CourseUpdate(BaseModel):
 
 # Schema for the full course data as returned in API responses
 class CourseResponse(CourseBase):
-    id: str = Field(alias="_id")
-    teacherId: str
-    tenantId: str
+    id: PyObjectId = Field(alias="_id")
+    teacherId: PyObjectId
+    tenantId: PyObjectId
     instructorName: Optional[str] = None
     enrolledStudents: int = 0
     createdAt: datetime
     updatedAt: datetime
 
-    class Config:
-        populate_by_name = True
-        json_encoders = {ObjectId: str}
+    model_config = ConfigDict(populate_by_name=True)
 
 # Schema for enrolling a student into a specific course
 class CourseEnrollment(BaseModel):
@@ -66,10 +66,8 @@ class QuizUpdate(BaseModel):
 
     @model_validator(mode="before")
     def convert_empty_strings(cls, data):
-        if isinstance(data, dict):
-            for k, v in data.items():
-                if v == "":
-                    data[k] = None
+        if isinstance(data, dict) and any(v == "" for v in data.values()):
+            return {k: (None if v == "" else v) for k, v in data.items()}
         return data
 
 class QuizResponse(BaseModel):
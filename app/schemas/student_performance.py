@@ -1,6 +1,6 @@
 from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class AddPointsRequest(BaseModel):
@@ -33,17 +33,16 @@ class StudentPerformanceResponse(BaseModel):
     xp: int
     xpToNextLevel: int
 
-    courseStats: Optional[List[dict]] = []
-    badges: Optional[List[dict]] = []
-    certificates: Optional[List[dict]] = []
-    weeklyStudyTime: Optional[List[dict]] = []
-    LeaderBoard: Optional[List[dict]] = []
+    courseStats: Optional[List[dict]] = Field(default_factory=list)
+    badges: Optional[List[dict]] = Field(default_factory=list)
+    certificates: Optional[List[dict]] = Field(default_factory=list)
+    weeklyStudyTime: Optional[List[dict]] = Field(default_factory=list)
+    LeaderBoard: Optional[List[dict]] = Field(default_factory=list)
 
     createdAt: Optional[datetime] = None
     updatedAt: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class CourseProgressRequest(BaseModel):
     courseId: str
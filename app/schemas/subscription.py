@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 from datetime import datetime
 
@@ -21,10 +21,24 @@ class Subscription(BaseModel):
     billing_cycle: str
     status: str
     expiry_date: datetime
-    payment_history: Optional[List[PaymentHistory]] = []
+    payment_history: Optional[List[PaymentHistory]] = Field(default_factory=list)
     userId: Optional[str] = None
     tenantId: str
 
-    class Config:
-        from_attributes = True
-        populate_by_name = True
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+# Partial update: only the fields sent by the client are written
+class SubscriptionUpdate(BaseModel):
+    plan: Optional[str] = None
+    max_students: Optional[int] = None
+    max_teachers: Optional[int] = None
+    max_courses: Optional[int] = None
+    ai_credits: Optional[int] = None
+    storage_gb: Optional[int] = None
+    price_per_month: Optional[float] = None
+    billing_cycle: Optional[str] = None
+    status: Optional[str] = None
+    expiry_date: Optional[datetime] = None
+    payment_history: Optional[List[PaymentHistory]] = None
+    userId: Optional[str] = None
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import List, Optional
 from datetime import datetime
 
@@ -8,13 +8,13 @@ class TeacherCreate(BaseModel):
     email: EmailStr
     password: str
     profileImageURL: Optional[str] = ""
-    assignedCourses: List[str] = []
+    assignedCourses: List[str] = Field(default_factory=list)
     contactNo: Optional[str]
     country: Optional[str]
     status: str = "active"
     role: str = "teacher"
-    qualifications: List[str] = []
-    subjects: List[str] = []
+    qualifications: List[str] = Field(default_factory=list)
+    subjects: List[str] = Field(default_factory=list)
     tenantId: str
 
 
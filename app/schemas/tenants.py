@@ -36,10 +36,8 @@ class TenantUpdate(BaseModel):
     # If a field has an empty string " " → it converts it to None
     @model_validator(mode="before")
     def empty_strings_to_none(cls, data):
-        if isinstance(data, dict):
-            for key, val in data.items():
-                if val == "":
-                    data[key] = None  # do NOT overwrite
+        if isinstance(data, dict) and any(val == "" for val in data.values()):
+            return {key: (None if val == "" else val) for key, val in data.items()}
         return data
 
 
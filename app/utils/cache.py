@@ -0,0 +1,102 @@
+import time
+from functools import wraps
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+class TTLCache:
+    """Small in-process cache whose entries expire after `ttl` seconds.
+
+    Each worker process holds its own copy, so keep TTLs short and call
+    `pop` wherever the cached source data changes.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 10_000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: dict = {}
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._data.pop(key, None)
+            return None
+        return value
+
+    def set(self, key, value) -> None:
+        if key not in self._data and len(self._data) >= self.maxsize:
+            # Dicts keep insertion order: drop the oldest entry
+            self._data.pop(next(iter(self._data)), None)
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+# Resolved auth context ({user_id, role, tenant_id}) keyed by user id
+user_cache = TTLCache(ttl=30)
+
+# Verified JWT claims keyed by the raw bearer token
+token_claims_cache = TTLCache(ttl=60)
+
+# Admin dashboard {teachers, students, courses} counts keyed by tenant id.
+# Invalidation only reaches the worker that handled the write, so with several
+# workers the counts can lag by up to `ttl` seconds; keep it short.
+tenant_counts_cache = TTLCache(ttl=60)
+
+# Serialized tenant documents keyed by tenant id
+tenant_cache = TTLCache(ttl=300)
+
+# Encoded JSON bodies of the tenant / subscription list routes, keyed by query params
+tenant_list_cache = TTLCache(ttl=30, maxsize=1_000)
+subscription_list_cache = TTLCache(ttl=30, maxsize=1_000)
+
+
+def invalidate_user(user_id) -> None:
+    """Drop a user's cached auth context after their user/profile changes."""
+    if user_id:
+        user_cache.pop(str(user_id))
+
+
+def invalidate_tenant_counts(tenant_id) -> None:
+    """Drop a tenant's cached dashboard counts after a create/delete."""
+    if tenant_id:
+        tenant_counts_cache.pop(str(tenant_id))
+
+
+def invalidate_tenant(tenant_id) -> None:
+    """Drop a cached tenant document (and the cached lists) after it is updated or deleted."""
+    tenant_list_cache.clear()
+    if tenant_id:
+        tenant_cache.pop(str(tenant_id))
+
+
+def cache_response(cache: TTLCache, adapter: TypeAdapter):
+    """Cache a route's encoded JSON body per set of call arguments.
+
+    On a miss the route's return value is validated and encoded with
+    `adapter` (standing in for response_model); hits skip Mongo and
+    serialization and return the stored bytes. Mutations clear `cache`.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(**kwargs):
+            key = tuple(sorted(kwargs.items()))
+            body = cache.get(key)
+            if body is None:
+                result = await func(**kwargs)
+                body = adapter.dump_json(adapter.validate_python(result))
+                cache.set(key, body)
+            return Response(content=body, media_type="application/json")
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,39 @@
+import hashlib
+from datetime import datetime
+
+import orjson
+from fastapi import Request
+
+# Clients may reuse a cached copy but must revalidate it first
+CACHE_CONTROL = "private, no-cache"
+
+
+def etag_headers(doc: dict) -> dict:
+    """ETag/Cache-Control headers built from a document's id and last-modified time."""
+    stamp = doc.get("updatedAt") or doc.get("createdAt")
+    if stamp is None:
+        return {}
+    if isinstance(stamp, datetime):
+        stamp = stamp.timestamp()
+    doc_id = doc.get("id") or doc.get("_id")
+    return {"ETag": f'W/"{doc_id}-{stamp}"', "Cache-Control": CACHE_CONTROL}
+
+
+def body_etag_headers(body: dict) -> dict:
+    """ETag/Cache-Control headers hashed from the whole response body.
+
+    For responses that join in data from other documents (e.g. a course's
+    instructorName), where the document's own updatedAt isn't enough.
+    """
+    raw = orjson.dumps(body, default=str, option=orjson.OPT_SORT_KEYS)
+    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    return {"ETag": f'W/"{digest}"', "Cache-Control": CACHE_CONTROL}
+
+
+def is_not_modified(request: Request, headers: dict) -> bool:
+    """True when the request's If-None-Match already names the current ETag."""
+    etag = headers.get("ETag")
+    if_none_match = request.headers.get("if-none-match")
+    if not etag or not if_none_match:
+        return False
+    return any(tag.strip() in (etag, "*") for tag in if_none_match.split(","))
@@ -0,0 +1,88 @@
+import unittest
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app.crud.quizzes import _decode_quiz_cursor, _encode_quiz_cursor, _quiz_seek_filter
+
+
+def _matches(doc: dict, query: dict) -> bool:
+    """Evaluate the subset of MongoDB query syntax _quiz_seek_filter emits."""
+    for key, cond in query.items():
+        if key == "$or":
+            if not any(_matches(doc, sub) for sub in cond):
+                return False
+            continue
+        value = doc.get(key)
+        if isinstance(cond, dict):
+            for op, target in cond.items():
+                if op == "$ne":
+                    ok = value != target
+                elif value is None or target is None:
+                    # $lt / $gt never match across null and a date
+                    ok = False
+                elif op == "$lt":
+                    ok = value < target
+                else:
+                    ok = value > target
+                if not ok:
+                    return False
+        elif value != cond:
+            return False
+    return True
+
+
+def _sort_key(doc: dict):
+    # Missing createdAt sorts below every date, as in MongoDB
+    created = doc.get("createdAt")
+    return (created is not None, created or datetime.min, doc["_id"])
+
+
+def _paginate(docs: list, sort_dir: int, limit: int) -> list:
+    ordered = sorted(docs, key=_sort_key, reverse=sort_dir == -1)
+    seen, cursor = [], None
+    while True:
+        query = _quiz_seek_filter(*_decode_quiz_cursor(cursor), sort_dir) if cursor else {}
+        page = [d for d in ordered if _matches(d, query)][: limit + 1]
+        if len(page) > limit:
+            page = page[:limit]
+            cursor = _encode_quiz_cursor(page[-1])
+        else:
+            cursor = None
+        if not page and cursor is None:
+            break
+        seen.extend(page)
+        if cursor is None:
+            break
+    return seen
+
+
+class QuizKeysetPaginationTests(unittest.TestCase):
+    def setUp(self):
+        start = datetime(2024, 1, 1)
+        self.dated = [
+            {"_id": ObjectId(), "createdAt": start + timedelta(days=i)} for i in range(4)
+        ]
+        self.undated = [{"_id": ObjectId()} for _ in range(3)]
+        self.docs = self.dated + self.undated
+
+    def test_descending_page_ending_on_last_dated_quiz_reaches_undated(self):
+        # limit 4: the first page ends exactly on the oldest dated quiz
+        seen = _paginate(self.docs, sort_dir=-1, limit=4)
+        self.assertEqual(len(seen), len(self.docs))
+        self.assertEqual({d["_id"] for d in seen}, {d["_id"] for d in self.docs})
+        self.assertEqual(seen[3]["_id"], self.dated[0]["_id"])
+
+    def test_every_page_size_visits_each_quiz_once(self):
+        for sort_dir in (1, -1):
+            for limit in range(1, len(self.docs) + 2):
+                seen = _paginate(self.docs, sort_dir, limit)
+                self.assertEqual(
+                    [d["_id"] for d in seen],
+                    [d["_id"] for d in sorted(self.docs, key=_sort_key, reverse=sort_dir == -1)],
+                    msg=f"sort_dir={sort_dir} limit={limit}",
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()